@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:36
+
+from django.db import migrations, models
+
+
+def keep_latest_active(apps, schema_editor):
+    # Older rows may predate the constraint; keep each user's newest active dataset
+    Dataset = apps.get_model('api', 'Dataset')
+    seen = set()
+    for dataset in Dataset.objects.filter(is_active=True).order_by('user_id', '-uploaded_at'):
+        if dataset.user_id in seen:
+            Dataset.objects.filter(pk=dataset.pk).update(is_active=False)
+        seen.add(dataset.user_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_delete_chatmessage'),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_active, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='dataset',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('user',), name='one_active_dataset_per_user'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_dataset_one_active_constraint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dataset',
+            index=models.Index(fields=['user', 'is_active'], name='dataset_user_active_idx'),
+        ),
+    ]
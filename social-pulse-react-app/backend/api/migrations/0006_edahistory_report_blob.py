@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-14 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_dataset_user_active_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='edahistory',
+            name='report_blob',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
@@ -44,7 +44,7 @@ def calculate_mis_kpis(df):
     # 4. Top Performing Platform
     platform_col = 'Platform' if 'Platform' in df.columns else 'platform' if 'platform' in df.columns else None
     if platform_col and eng_col:
-        plat_performance = df.groupby(platform_col)[eng_col].mean().sort_values(ascending=False)
+        plat_performance = df.groupby(platform_col, observed=True)[eng_col].mean().sort_values(ascending=False)
         if not plat_performance.empty:
             kpis['top_platform'] = plat_performance.index[0]
             kpis['top_platform_score'] = round(float(plat_performance.iloc[0]), 2)
@@ -82,7 +82,7 @@ def get_platform_summaries(df):
     if not platform_col or not eng_col:
         return []
         
-    summary = df.groupby(platform_col).agg({
+    summary = df.groupby(platform_col, observed=True).agg({
         eng_col: ['mean', 'max'],
         reach_col: 'sum' if reach_col else 'count'
     }).reset_index()
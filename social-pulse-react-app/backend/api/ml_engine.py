@@ -4,6 +4,10 @@ Handles LightGBM regression, CatBoost classification, and dynamic insights.
 """
 import os
 import json
+import importlib
+import pickle
+import threading
+from types import SimpleNamespace
 import joblib
 import numpy as np
 import pandas as pd
@@ -11,60 +15,379 @@ from django.conf import settings
 import gc
 
 
+def _import_ml_libraries():
+    for module in ('lightgbm', 'catboost'):
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
 
 
-def _prepare_features(df):
+def warm_up():
     """
-    Prepare feature matrix from the dataframe.
-    Returns X (DataFrame), feature_columns (list)
-    """
-    feature_cols = []
-    df_features = pd.DataFrame()
-
-    # Numerical features
-    for col in ['Caption_Length', 'Hashtag_count', 'Hour', 'Day_of_Week']:
-        if col in df.columns:
-            df_features[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            feature_cols.append(col)
-
-    # Also check lowercase/alternate names
-    alt_map = {
-        'caption_length': 'Caption_Length',
-        'hashtag_count': 'Hashtag_count',
-        'hour': 'Hour',
-        'day_of_week': 'Day_of_Week',
+    Import LightGBM and CatBoost on a background thread. Each takes hundreds
+    of milliseconds to import; called once a server process starts, the
+    function-level imports below then find them already loaded.
+    """
+    threading.Thread(target=_import_ml_libraries, name='ml-warm-up', daemon=True).start()
+
+
+# Loaded model artifacts by file path, as (mtime, model). One entry per
+# path, so retraining replaces the old model instead of keeping it around
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def _cached_load(path, loader):
+    """Return loader(path), reused until the file's mtime changes."""
+    mtime = os.path.getmtime(path)
+    with _MODEL_LOCK:
+        entry = _MODEL_CACHE.get(path)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, loader(path))
+            _MODEL_CACHE[path] = entry
+        return entry[1]
+
+
+def _read_model(path):
+    # Uncompressed blobs let any numpy arrays inside be memory-mapped
+    return joblib.load(path, mmap_mode='r')
+
+
+def _load_model(path):
+    """
+    Load a pickled model blob, reusing the in-memory copy across requests.
+    The file mtime is checked on each call so retraining invalidates it.
+    """
+    return _cached_load(path, _read_model)
+
+
+# Per-dataset facts reused across get_insights/get_dashboard_data calls,
+# keyed by the caller's cache_key (file path + mtime, so a re-upload starts
+# a fresh entry)
+DATASET_CACHE = {}
+DATASET_CACHE_SIZE = 8
+# Aggregates kept per dataset entry (one per chart/insight and filter value)
+AGGREGATE_CACHE_SIZE = 256
+# Aggregate key part for a filter value the dataset doesn't contain
+_UNMATCHED = '\0unmatched'
+_DATASET_CACHE_LOCK = threading.Lock()
+
+
+def _dataset_stats(df, cols, cache_key):
+    """Category sets and per-filter aggregate slots for ``df``, memoized under cache_key."""
+    with _DATASET_CACHE_LOCK:
+        stats = DATASET_CACHE.get(cache_key) if cache_key is not None else None
+    if stats is not None:
+        return stats
+
+    stats = {
+        'platforms': frozenset(df[cols.platform].dropna().unique()) if cols.platform else frozenset(),
+        'content_types': frozenset(df[cols.ctype].dropna().unique()) if cols.ctype else frozenset(),
+        'aggregates': {},
     }
-    for alt, canonical in alt_map.items():
-        if canonical not in df_features.columns and alt in df.columns:
-            df_features[canonical] = pd.to_numeric(df[alt], errors='coerce').fillna(0)
-            feature_cols.append(canonical)
-
-    # One-Hot Encode categorical features
-    for cat_col in ['Platform', 'Content_Type']:
-        col_to_use = cat_col if cat_col in df.columns else cat_col.lower() if cat_col.lower() in df.columns else None
-        if col_to_use:
-            dummies = pd.get_dummies(df[col_to_use], prefix=cat_col)
-            df_features = pd.concat([df_features, dummies], axis=1)
+    if cache_key is not None:
+        with _DATASET_CACHE_LOCK:
+            while len(DATASET_CACHE) >= DATASET_CACHE_SIZE:
+                DATASET_CACHE.pop(next(iter(DATASET_CACHE)))
+            DATASET_CACHE[cache_key] = stats
+    return stats
+
+
+def _cached(stats, key, compute):
+    """Return the aggregate stored under key in a dataset's stats, computing it on first use."""
+    aggregates = stats['aggregates']
+    value = aggregates.get(key)
+    if value is None:
+        value = compute()
+        with _DATASET_CACHE_LOCK:
+            while len(aggregates) >= AGGREGATE_CACHE_SIZE:
+                aggregates.pop(next(iter(aggregates)))
+            aggregates[key] = value
+    return value
 
-    feature_cols = list(df_features.columns)
-    return df_features, feature_cols
 
+def _booster_meta_path(path):
+    return os.path.splitext(path)[0] + '.json'
 
-def train_lightgbm(df):
-    """Train a LightGBM regressor to predict Engagement_Rate."""
+
+def _read_booster(path):
     import lightgbm as lgb
+    with open(_booster_meta_path(path)) as f:
+        meta = json.load(f)
+    return {'model': lgb.Booster(model_file=path), **meta}
+
+
+def _load_booster(path):
+    """
+    Load a LightGBM booster saved with save_model and its JSON sidecar
+    (feature_columns, category_index), cached like _load_model.
+    """
+    return _cached_load(path, _read_booster)
+
+
+ENGAGEMENT_CLASSES = ['Low', 'Average', 'High']
+NUMERIC_FEATURES = ['Caption_Length', 'Hashtag_count', 'Hour', 'Day_of_Week']
+CATEGORICAL_FEATURES = ['Platform', 'Content_Type']
+
+
+def _three_way_bins(vals, low, high):
+    """Vectorized 0/1/2 codes for x < low, low <= x <= high, x > high."""
+    return np.digitize(vals, [low, np.nextafter(high, np.inf)])
+
+
+# Accepted spellings (lower-cased) for each column the insight builders use
+_COLUMN_ALIASES = {
+    'eng': ('engagement_rate', 'engagement rate', 'engagement'),
+    'platform': ('platform',),
+    'ctype': ('content_type', 'content type'),
+    'date': ('date',),
+    'reach': ('reach',),
+    'hashtag': ('hashtags', 'hashtag'),
+    'hour': ('hour',),
+    'day': ('day_of_week', 'day', 'dayofweek'),
+    'caption': ('caption_length', 'caption length'),
+}
+
+
+def _resolve_cols(df):
+    """
+    Map the dataframe's actual column names onto canonical keys in one pass.
+    Returns a SimpleNamespace whose attributes are None for missing columns.
+    """
+    lowered = {}
+    for col in df.columns:
+        lowered.setdefault(str(col).lower(), col)
 
-    target_col = None
-    for candidate in ['Engagement_Rate', 'engagement_rate']:
-        if candidate in df.columns:
-            target_col = candidate
-            break
+    resolved = {}
+    for key, aliases in _COLUMN_ALIASES.items():
+        resolved[key] = next((lowered[a] for a in aliases if a in lowered), None)
+    return SimpleNamespace(**resolved)
+
+
+def analysis_columns(columns):
+    """
+    The subset of columns that get_insights and get_dashboard_data read:
+    every accepted spelling above plus the model features. Free text such
+    as captions is left out, so callers can load just these.
+    """
+    wanted = {alias for aliases in _COLUMN_ALIASES.values() for alias in aliases}
+    wanted.update(col.lower() for col in NUMERIC_FEATURES + CATEGORICAL_FEATURES)
+    return [col for col in columns if str(col).lower() in wanted]
+
+
+def _float_array(values):
+    """Coerce a Series/array to float64 NumPy, mapping bad or missing values to NaN."""
+    return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _sparse_keys(k, minlength=0):
+    """
+    Whether integer keys are too spread out to bincount: a stray huge key
+    would size the array by its value (or, past int64, wrap negative), so
+    such keys are counted by np.unique instead.
+    """
+    return bool(k.size) and (k.min() < 0 or k.max() > max(minlength, 4 * k.size + 64))
+
+
+def _bucket_means(keys, values, minlength=0):
+    """
+    Mean of `values` per non-negative integer key using two weighted bincounts.
+    Returns (buckets, means, counts): normally every key 0..N-1, empty ones
+    with count 0; for _sparse_keys, only the occupied keys in order.
+    """
+    keys = _float_array(keys)
+    values = _float_array(values)
+    mask = np.isfinite(keys) & np.isfinite(values) & (keys >= 0)
+    k = keys[mask].astype(np.int64)
+    if _sparse_keys(k, minlength):
+        buckets, k = np.unique(k, return_inverse=True)
+        minlength = 0
+    else:
+        buckets = None
+    sums = np.bincount(k, weights=values[mask], minlength=minlength)
+    counts = np.bincount(k, minlength=minlength)
+    if buckets is None:
+        buckets = np.arange(counts.size)
+    return buckets, sums / np.maximum(counts, 1), counts
+
+
+def _hashtag_tokens(tags):
+    """
+    One row per hashtag, keeping the index label of the post it came from.
+    Commas become spaces and the split is pandas' plain whitespace split,
+    never a regex, so no blank tokens are produced; rows without tags drop.
+    """
+    return tags.astype(str).str.replace(',', ' ', regex=False).str.split().explode().dropna()
+
+
+# Below this many posts, per-hashtag means are accumulated in a plain loop;
+# exploding a frame of one row per tag costs more than it saves
+HASHTAG_STREAM_ROWS = 1000
+
+
+def _hashtag_means(tags, engagement):
+    """
+    Mean engagement and count of non-null engagement per hashtag, indexed by
+    hashtag in sorted order: the groupby(...).agg(['mean', 'count']) of the
+    exploded tokens, streamed through dicts for small frames.
+    """
+    if len(tags) >= HASHTAG_STREAM_ROWS:
+        tokens = _hashtag_tokens(tags)
+        token_eng = engagement.reindex(tokens.index)
+        return token_eng.groupby(tokens.to_numpy()).agg(['mean', 'count'])
+
+    sums = {}
+    counts = {}
+    for tag_str, eng in zip(tags.astype(str).to_numpy(), _float_array(engagement)):
+        valid = not np.isnan(eng)
+        for tag in tag_str.replace(',', ' ').split():
+            if valid:
+                sums[tag] = sums.get(tag, 0.0) + eng
+                counts[tag] = counts.get(tag, 0) + 1
+            else:
+                sums.setdefault(tag, 0.0)
+                counts.setdefault(tag, 0)
+
+    names = sorted(sums)
+    total = np.array([sums[t] for t in names], dtype=np.float64)
+    count = np.array([counts[t] for t in names], dtype=np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(count > 0, total / count, np.nan)
+    return pd.DataFrame({'mean': mean, 'count': count}, index=pd.Index(names, dtype=object))
+
+
+def _top_positions(values, k):
+    """
+    Positions of the k largest values, largest first with ties in position
+    order, by an O(N) argpartition instead of a full sort. NaN ranks last.
+    """
+    values = np.where(np.isnan(values), -np.inf, values)
+    k = min(k, len(values))
+    if not k:
+        return np.empty(0, dtype=np.int64)
+    top = np.sort(np.argpartition(-values, k - 1)[:k])
+    return top[np.argsort(-values[top], kind='stable')]
+
+
+def _key_counts(keys):
+    """
+    Equivalent of keys.value_counts().sort_index() for small integer keys
+    such as Hour, as one bincount. Non-numeric keys fall back to value_counts.
+    """
+    if not pd.api.types.is_numeric_dtype(keys):
+        return keys.value_counts().sort_index()
+    keys = _float_array(keys)
+    k = keys[np.isfinite(keys) & (keys >= 0)].astype(np.int64)
+    if _sparse_keys(k):
+        observed, counts = np.unique(k, return_counts=True)
+        return pd.Series(counts, index=observed)
+    counts = np.bincount(k)
+    observed = np.flatnonzero(counts)
+    return pd.Series(counts[observed], index=observed)
+
+
+def _group_means(keys, values, minlength=0):
+    """
+    Equivalent of values.groupby(keys).mean() for small integer keys such as
+    Hour or Day_of_Week, using _bucket_means instead of groupby machinery.
+    Non-numeric keys fall back to a regular groupby, over observed
+    categories only when the keys are categorical.
+    """
+    if not pd.api.types.is_numeric_dtype(keys):
+        return values.groupby(keys, observed=True).mean()
+    buckets, means, counts = _bucket_means(keys, values, minlength)
+    observed = counts > 0
+    return pd.Series(means[observed], index=buckets[observed])
 
+
+def _one_hot(series):
+    """
+    One-hot encode a label column by scattering its factorized codes into a
+    preallocated uint8 matrix, one column per sorted unique value (the
+    pd.get_dummies layout). Returns (matrix, uniques).
+    """
+    codes, uniques = pd.factorize(series, sort=True)
+    mat = np.zeros((len(series), len(uniques)), dtype=np.uint8)
+    rows = np.flatnonzero(codes >= 0)
+    mat[rows, codes[rows]] = 1
+    return mat, list(uniques)
+
+
+TARGET_COLUMN = 'Engagement_Rate'
+
+
+def _training_columns(df):
+    """
+    Map each model feature and the target to the column it is read from:
+    the canonical name, else its lower-case spelling. Resolved against one
+    set of the frame's columns; absent names are left out.
+    """
+    present = set(df.columns)
+    resolved = {}
+    for name in NUMERIC_FEATURES + CATEGORICAL_FEATURES + [TARGET_COLUMN]:
+        if name in present:
+            resolved[name] = name
+        elif name.lower() in present:
+            resolved[name] = name.lower()
+    return resolved
+
+
+def _training_target(df):
+    """The numeric Engagement_Rate column (NaN as 0); ValueError when absent."""
+    target_col = _training_columns(df).get(TARGET_COLUMN)
     if target_col is None:
         raise ValueError("Target column 'Engagement_Rate' not found in dataset.")
+    return pd.to_numeric(df[target_col], errors='coerce').fillna(0)
 
-    y = pd.to_numeric(df[target_col], errors='coerce').fillna(0)
-    X, feature_columns = _prepare_features(df)
+
+def prepare_features(df):
+    """
+    Prepare feature matrix from the dataframe.
+    Returns X (DataFrame), feature_columns (list), category_index (dict)
+
+    category_index maps each categorical feature to {value: column position}
+    so inference can set the one-hot flags without parsing column names.
+    """
+    source = _training_columns(df)
+
+    # Every feature column goes into this one dict, so the frame is built
+    # once at the end instead of concatenating per-feature blocks.
+    # Numerical features are float32: trees bin the inputs anyway
+    columns = {
+        col: pd.to_numeric(df[source[col]], errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+        for col in NUMERIC_FEATURES if col in source
+    }
+    category_index = {}
+
+    # One-Hot Encode categorical features (column names match pd.get_dummies)
+    for cat_col in CATEGORICAL_FEATURES:
+        col_to_use = source.get(cat_col)
+        if col_to_use:
+            mat, uniques = _one_hot(df[col_to_use])
+            category_index[cat_col] = {str(u): len(columns) + i for i, u in enumerate(uniques)}
+            columns.update((f"{cat_col}_{u}", mat[:, i]) for i, u in enumerate(uniques))
+
+    df_features = pd.DataFrame(columns, index=df.index)
+    feature_cols = list(df_features.columns)
+    return df_features, feature_cols, category_index
+
+
+def training_threads():
+    """Threads a single trainer may use: every core but one, left for the web worker."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def train_lightgbm(df, features=None, n_jobs=None):
+    """
+    Train a LightGBM regressor to predict Engagement_Rate.
+    features: optional prepare_features(df) result to reuse across trainers.
+    n_jobs: thread count, training_threads() by default.
+    """
+    import lightgbm as lgb
+
+    y = _training_target(df)
+    X, feature_columns, category_index = features if features is not None else prepare_features(df)
 
     if X.empty or len(feature_columns) == 0:
         raise ValueError("No valid features found for training.")
@@ -72,15 +395,25 @@ def train_lightgbm(df):
     from sklearn.model_selection import train_test_split
     from sklearn.metrics import mean_squared_error, r2_score
     
+    # prepare_features already yields float32 numerics and uint8 one-hots;
+    # split one float32 array rather than the frame, so the shuffle copies
+    # 4 bytes per cell and LightGBM bins the array without converting it
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42
+        X.to_numpy(dtype=np.float32), y.to_numpy(dtype=np.float32), test_size=0.2, random_state=42
     )
 
+    # Set the thread count explicitly; LightGBM's default can oversubscribe.
+    # The features are a handful of low-cardinality numerics plus one-hots, so
+    # 63 bins lose nothing and keep histogram construction cheap; with many
+    # rows and few total bins the row-wise histogram layout is the faster one.
+    n_jobs = n_jobs or training_threads()
     model = lgb.LGBMRegressor(
         n_estimators=100, learning_rate=0.1, max_depth=6,
-        num_leaves=31, random_state=42, verbose=-1,
+        num_leaves=31, random_state=42, verbose=-1, n_jobs=n_jobs,
+        max_bin=63, min_child_samples=20, feature_pre_filter=False,
+        force_row_wise=True,
     )
-    model.fit(X_train, y_train)
+    model.fit(X_train, y_train, feature_name=feature_columns)
 
     y_pred = model.predict(X_test)
     mse = float(mean_squared_error(y_test, y_pred))
@@ -89,8 +422,13 @@ def train_lightgbm(df):
 
     models_dir = os.path.join(settings.MEDIA_ROOT, 'models')
     os.makedirs(models_dir, exist_ok=True)
-    model_path = os.path.join(models_dir, 'lgbm_regression.pkl')
-    joblib.dump({'model': model, 'feature_columns': feature_columns}, model_path)
+    model_path = os.path.join(models_dir, 'lgbm_regression.txt')
+
+    # Native booster text plus a JSON sidecar; the sidecar goes first so the
+    # booster's mtime (the load cache key) is never older than its metadata
+    with open(_booster_meta_path(model_path), 'w') as f:
+        json.dump({'feature_columns': feature_columns, 'category_index': category_index}, f)
+    model.booster_.save_model(model_path)
 
     # Aggressive memory cleanup
     for var in ['X', 'X_train', 'X_test', 'y', 'y_train', 'y_test', 'model']:
@@ -100,7 +438,7 @@ def train_lightgbm(df):
 
     return {
         'model_path': model_path,
-        'model_relative': 'models/lgbm_regression.pkl',
+        'model_relative': 'models/lgbm_regression.txt',
         'metrics': {
             'mse': round(mse, 4),
             'rmse': round(rmse, 4),
@@ -112,49 +450,44 @@ def train_lightgbm(df):
     }
 
 
-def train_catboost(df):
-    """Train a CatBoost classifier to predict engagement category (Low/Average/High)."""
+def train_catboost(df, features=None, n_jobs=None):
+    """
+    Train a CatBoost classifier to predict engagement category (Low/Average/High).
+    features: optional prepare_features(df) result to reuse across trainers.
+    n_jobs: thread count, training_threads() by default.
+    """
     from catboost import CatBoostClassifier
 
-    target_col = None
-    for candidate in ['Engagement_Rate', 'engagement_rate']:
-        if candidate in df.columns:
-            target_col = candidate
-            break
+    engagement = _training_target(df)
 
-    if target_col is None:
-        raise ValueError("Target column 'Engagement_Rate' not found in dataset.")
-
-    engagement = pd.to_numeric(df[target_col], errors='coerce').fillna(0)
-
-    def categorize(val):
-        if val < 2:
-            return 'Low'
-        elif val <= 8:
-            return 'Average'
-        else:
-            return 'High'
-
-    from sklearn.preprocessing import LabelEncoder
     from sklearn.model_selection import train_test_split
     from sklearn.metrics import accuracy_score, f1_score
 
-    y_labels = engagement.apply(categorize)
-    le = LabelEncoder()
-    y = le.fit_transform(y_labels)
+    # Codes index into ENGAGEMENT_CLASSES: 0=Low (<2), 1=Average (2-8), 2=High (>8)
+    y = _three_way_bins(engagement.to_numpy(dtype=np.float64), 2.0, 8.0).astype(np.int8)
 
-    X, feature_columns = _prepare_features(df)
+    X, feature_columns, category_index = features if features is not None else prepare_features(df)
 
     if X.empty or len(feature_columns) == 0:
         raise ValueError("No valid features found for training.")
 
+    # CatBoost quantizes a column at a time, and converts DataFrames itself
+    # on every fit; hand it column-major float32 arrays instead
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
+        X.to_numpy(dtype=np.float32), y, test_size=0.2, random_state=42, stratify=y
     )
+    X_train = np.asfortranarray(X_train)
+    X_test = np.asfortranarray(X_test)
 
+    # CatBoost can default to half the cores on multi-socket hosts; match
+    # LightGBM and set the thread count explicitly
+    n_jobs = n_jobs or training_threads()
     model = CatBoostClassifier(
         iterations=100, learning_rate=0.1, depth=6,
         random_seed=42, verbose=0, loss_function='MultiClass',
+        thread_count=n_jobs,
+        # No catboost_info/ training logs in the working directory
+        allow_writing_files=False,
     )
     model.fit(X_train, y_train)
 
@@ -162,18 +495,19 @@ def train_catboost(df):
     accuracy = float(accuracy_score(y_test, y_pred))
     f1 = float(f1_score(y_test, y_pred, average='weighted'))
 
-    class_names = le.inverse_transform(sorted(set(y)))
+    # Classes present in the labels; a bincount over the 3 codes, not a sort
+    class_names = [ENGAGEMENT_CLASSES[i] for i in np.flatnonzero(np.bincount(y, minlength=3))]
 
     models_dir = os.path.join(settings.MEDIA_ROOT, 'models')
     os.makedirs(models_dir, exist_ok=True)
     model_path = os.path.join(models_dir, 'catboost_classification.pkl')
     joblib.dump({
         'model': model, 'feature_columns': feature_columns,
-        'label_encoder': le, 'class_names': list(class_names),
-    }, model_path)
+        'category_index': category_index, 'class_names': list(ENGAGEMENT_CLASSES),
+    }, model_path, compress=0, protocol=pickle.HIGHEST_PROTOCOL)
 
     # Aggressive memory cleanup
-    for var in ['X', 'X_train', 'X_test', 'y', 'y_train', 'y_test', 'model', 'engagement', 'le', 'y_labels']:
+    for var in ['X', 'X_train', 'X_test', 'y', 'y_train', 'y_test', 'model', 'engagement']:
         if var in locals():
             del locals()[var]
     gc.collect()
@@ -206,49 +540,84 @@ def _sanitize_json(data):
     return data
 
 
-def get_insights(df, platform='', content_type=''):
-    """Generate dynamic insights for a given platform and content type."""
-    filtered = df.copy()
+def _feature_medians(filtered):
+    """Median of every numeric model feature present in the frame, in one pass."""
+    present = [c for c in NUMERIC_FEATURES if c in filtered.columns]
+    return filtered[present].apply(pd.to_numeric, errors='coerce').median()
 
-    # Normalize column names to find Platform and Content Type
-    platform_col = None
-    for col in df.columns:
-        if col.lower() == 'platform':
-            platform_col = col
-            break
 
-    ctype_col = None
-    for col in df.columns:
-        if col.lower() in ['content_type', 'content type']:
-            ctype_col = col
-            break
+def _category_index_from_names(feature_columns):
+    """Rebuild a category_index from 'Platform_'/'Content_Type_' column names (older blobs)."""
+    index = {}
+    for i, col in enumerate(feature_columns):
+        for cat_col in CATEGORICAL_FEATURES:
+            if col.startswith(cat_col + '_'):
+                index.setdefault(cat_col, {})[col[len(cat_col) + 1:]] = i
+    return index
+
+
+def _inference_row(model_data, medians, platform, content_type):
+    """
+    Build the single (1, n_features) float32 row fed to the models: one-hot
+    flags for the requested platform/content type, medians for numerics.
+    """
+    feature_columns = model_data['feature_columns']
+    category_index = model_data.get('category_index') or _category_index_from_names(feature_columns)
 
-    if platform and platform_col and platform in df[platform_col].values:
-        filtered = filtered[filtered[platform_col] == platform]
-    if content_type and ctype_col and content_type in df[ctype_col].values:
-        filtered = filtered[filtered[ctype_col] == content_type]
+    # One-hot columns have no median, so they (and missing numerics) start at 0
+    x = medians.reindex(feature_columns).to_numpy(dtype=np.float32, na_value=0.0).reshape(1, -1)
 
-    if len(filtered) == 0:
-        filtered = df.copy()
+    for cat_col, value in (('Platform', platform), ('Content_Type', content_type)):
+        pos = category_index.get(cat_col, {}).get(value) if value else None
+        if pos is not None:
+            x[0, pos] = 1.0
+    return x
 
-    # Find Engagement Rate column
-    eng_col = None
-    for col in filtered.columns:
-        if col.lower() in ['engagement_rate', 'engagement rate', 'engagement']:
-            eng_col = col
-            break
+
+def get_insights(df, platform='', content_type='', cache_key=None):
+    """
+    Generate dynamic insights for a given platform and content type.
+    cache_key identifies the dataset so its category sets, medians and
+    group means are reused across calls; None computes them fresh.
+    """
+    # Read-only below; boolean masks already hand back new frames
+    filtered = df
+
+    # Normalize column names once for every insight below
+    cols = _resolve_cols(df)
+    platform_col = cols.platform
+    ctype_col = cols.ctype
+    stats = _dataset_stats(df, cols, cache_key)
+
+    # Values the dataset doesn't have filter nothing, so they share the
+    # unfiltered aggregates rather than each caching a copy
+    platform_key = platform if platform and platform_col and platform in stats['platforms'] else ''
+    ctype_key = content_type if content_type and ctype_col and content_type in stats['content_types'] else ''
+
+    # AND the filters into one mask so the frame is taken at most once
+    mask = None
+    if platform_key:
+        mask = (df[platform_col] == platform_key).to_numpy(dtype=bool)
+    if ctype_key:
+        ctype_mask = (df[ctype_col] == ctype_key).to_numpy(dtype=bool)
+        mask = ctype_mask if mask is None else mask & ctype_mask
+
+    # A mask that keeps every row would only copy the frame
+    if mask is not None and mask.any() and not mask.all():
+        filtered = df[mask]
+
+    eng_col = cols.eng
 
     insights = {}
 
     # 1. Best Time to Post
-    hour_col = None
-    for col in filtered.columns:
-        if col.lower() == 'hour':
-            hour_col = col
-            break
+    hour_col = cols.hour
 
     if hour_col and eng_col:
-        hour_eng = filtered.groupby(hour_col)[eng_col].mean().sort_values(ascending=False)
+        hour_eng = _cached(
+            stats, ('hour_eng', platform_key, ctype_key),
+            lambda: _group_means(filtered[hour_col], filtered[eng_col], 24).sort_values(ascending=False),
+        )
         top_hours = hour_eng.head(3)
         insights['best_times'] = [
             {'hour': int(h), 'avg_engagement': round(float(v), 2)}
@@ -258,15 +627,14 @@ def get_insights(df, platform='', content_type=''):
         insights['best_times'] = []
 
     # 2. Best Day
-    day_col = None
-    for col in filtered.columns:
-        if col.lower() in ['day_of_week', 'day', 'dayofweek']:
-            day_col = col
-            break
+    day_col = cols.day
 
     if day_col and eng_col:
         day_names_map = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}
-        day_eng = filtered.groupby(day_col)[eng_col].mean().sort_values(ascending=False)
+        day_eng = _cached(
+            stats, ('day_eng', platform_key, ctype_key),
+            lambda: _group_means(filtered[day_col], filtered[eng_col], 7).sort_values(ascending=False),
+        )
         best_day_val = day_eng.index[0] if len(day_eng) > 0 else 0
         try:
             best_day_name = day_names_map.get(int(best_day_val), str(best_day_val))
@@ -281,90 +649,79 @@ def get_insights(df, platform='', content_type=''):
         insights['best_day'] = {'day': 'N/A', 'avg_engagement': 0}
 
     # 3. Best Caption Length Strategy
-    caption_col = None
-    for col in filtered.columns:
-        if col.lower() in ['caption_length', 'caption length']:
-            caption_col = col
-            break
+    caption_col = cols.caption
 
     if caption_col and eng_col:
-        temp_df = filtered[[caption_col, eng_col]].copy()
-        
-        def get_len_cat(x):
-            try:
-                val = float(x)
-                if val < 50: return 'Short (<50 chars)'
-                elif val <= 150: return 'Medium (50-150 chars)'
-                else: return 'Long (>150 chars)'
-            except:
-                return 'Medium (50-150 chars)'
-
-        temp_df['Length_Cat'] = temp_df[caption_col].apply(get_len_cat)
-        cap_eng = temp_df.groupby('Length_Cat')[eng_col].mean().sort_values(ascending=False)
-        
-        if len(cap_eng) > 0:
-            insights['best_caption_length'] = cap_eng.index[0]
+        # Non-numeric lengths fall into the Medium bucket
+        cap_vals = pd.to_numeric(filtered[caption_col], errors='coerce').fillna(100).to_numpy()
+        len_labels = ['Short (<50 chars)', 'Medium (50-150 chars)', 'Long (>150 chars)']
+        _, cap_means, cap_counts = _bucket_means(_three_way_bins(cap_vals, 50, 150), filtered[eng_col], 3)
+
+        if cap_counts.any():
+            best = int(np.where(cap_counts > 0, cap_means, -np.inf).argmax())
+            insights['best_caption_length'] = len_labels[best]
         else:
             insights['best_caption_length'] = 'Medium (50-150 chars)'
     else:
         insights['best_caption_length'] = 'Medium (50-150 chars)'
 
     # 3. Best Hashtags
-    hashtag_col = None
-    for col in filtered.columns:
-        if col.lower() in ['hashtags', 'hashtag']:
-            hashtag_col = col
-            break
-            
+    hashtag_col = cols.hashtag
+
     if hashtag_col and eng_col:
-        hashtag_df = filtered[[hashtag_col, eng_col]].copy()
-        hashtag_df[hashtag_col] = hashtag_df[hashtag_col].astype(str)
-        hashtag_df = hashtag_df.assign(
-            **{hashtag_col: hashtag_df[hashtag_col].str.split(r'[\s,]+')},
-        ).explode(hashtag_col)
-        hashtag_df = hashtag_df[hashtag_df[hashtag_col].str.strip() != '']
-        hashtag_df[hashtag_col] = hashtag_df[hashtag_col].str.strip()
-
-        if len(hashtag_df) > 0:
-            hashtag_eng = hashtag_df.groupby(hashtag_col)[eng_col].agg(['mean', 'count'])
-            hashtag_eng = hashtag_eng[hashtag_eng['count'] >= 1].sort_values('mean', ascending=False)
-            top_hashtags = hashtag_eng.head(5)
+        hashtag_eng = _hashtag_means(filtered[hashtag_col], filtered[eng_col])
+
+        if len(hashtag_eng) > 0:
+            top_hashtags = hashtag_eng.iloc[_top_positions(hashtag_eng['mean'].to_numpy(dtype=np.float64), 5)]
             insights['best_hashtags'] = [
-                {'hashtag': str(h), 'avg_engagement': round(float(row['mean']), 2), 'count': int(row['count'])}
-                for h, row in top_hashtags.iterrows()
+                {'hashtag': str(h), 'avg_engagement': round(float(m), 2), 'count': int(c)}
+                for h, m, c in zip(
+                    top_hashtags.index, top_hashtags['mean'].to_numpy(), top_hashtags['count'].to_numpy(),
+                )
             ]
         else:
             insights['best_hashtags'] = []
-        del hashtag_df
+        del hashtag_eng
     else:
         insights['best_hashtags'] = []
 
+    # Shared by both model inputs below
+    medians = _cached(stats, ('medians', platform_key, ctype_key), lambda: _feature_medians(filtered))
+
+    def _input_row(model_data):
+        # Both models are trained on the same feature columns, so the row is
+        # built once per filter and reused; predict never writes to it. The
+        # one-hot flags only depend on values the model has a column for.
+        category_index = model_data.get('category_index') or _category_index_from_names(model_data['feature_columns'])
+        flags = tuple(
+            value if value in category_index.get(cat_col, {}) else ''
+            for cat_col, value in (('Platform', platform), ('Content_Type', content_type))
+        )
+        return _cached(
+            stats, ('input_row', platform_key, ctype_key, *flags, tuple(model_data['feature_columns'])),
+            lambda: _inference_row(model_data, medians, *flags),
+        )
+
     # 4. Predicted Engagement using LightGBM
     insights['predicted_engagement'] = None
     try:
-        model_path = os.path.join(settings.MEDIA_ROOT, 'models', 'lgbm_regression.pkl')
-        if os.path.exists(model_path):
-            model_data = joblib.load(model_path)
-            model = model_data['model']
-            feature_columns = model_data['feature_columns']
-
-            input_row = {}
-            for col in feature_columns:
-                if col.startswith('Platform_'):
-                    plat_name = col.replace('Platform_', '')
-                    input_row[col] = 1.0 if platform and plat_name == platform else 0.0
-                elif col.startswith('Content_Type_'):
-                    ct_name = col.replace('Content_Type_', '')
-                    input_row[col] = 1.0 if content_type and ct_name == content_type else 0.0
-                else:
-                    if col in filtered.columns:
-                        val = pd.to_numeric(filtered[col], errors='coerce').median()
-                        input_row[col] = float(val) if not np.isnan(val) else 0.0
-                    else:
-                        input_row[col] = 0.0
-
-            input_df = pd.DataFrame([input_row])[feature_columns]
-            prediction = model.predict(input_df)[0]
+        models_dir = os.path.join(settings.MEDIA_ROOT, 'models')
+        booster_path = os.path.join(models_dir, 'lgbm_regression.txt')
+        legacy_path = os.path.join(models_dir, 'lgbm_regression.pkl')
+        booster = None
+        if os.path.exists(booster_path):
+            model_data = _load_booster(booster_path)
+            booster = model_data['model']
+        elif os.path.exists(legacy_path):
+            # Pickled sklearn wrapper from before models were saved natively
+            model_data = _load_model(legacy_path)
+            booster = model_data['model'].booster_
+
+        if booster is not None:
+            input_arr = _input_row(model_data)
+            # One row: skip the OpenMP thread team. The shape check stays on so
+            # a sidecar that doesn't match the booster fails instead of guessing
+            prediction = booster.predict(input_arr, num_threads=1)[0]
             insights['predicted_engagement'] = round(float(prediction), 2)
     except Exception:
         insights['predicted_engagement'] = None
@@ -374,41 +731,21 @@ def get_insights(df, platform='', content_type=''):
     try:
         model_path = os.path.join(settings.MEDIA_ROOT, 'models', 'catboost_classification.pkl')
         if os.path.exists(model_path):
-            model_data = joblib.load(model_path)
+            model_data = _load_model(model_path)
             model = model_data['model']
-            feature_columns = model_data['feature_columns']
-            le = model_data.get('label_encoder')
-            
-            if le:
-                input_row = {}
-                for col in feature_columns:
-                    if col.startswith('Platform_'):
-                        plat_name = col.replace('Platform_', '')
-                        input_row[col] = 1.0 if platform and plat_name == platform else 0.0
-                    elif col.startswith('Content_Type_'):
-                        ct_name = col.replace('Content_Type_', '')
-                        input_row[col] = 1.0 if content_type and ct_name == content_type else 0.0
-                    else:
-                        if col in filtered.columns:
-                            val = pd.to_numeric(filtered[col], errors='coerce').median()
-                            input_row[col] = float(val) if not np.isnan(val) else 0.0
-                        else:
-                            input_row[col] = 0.0
-
-                input_df = pd.DataFrame([input_row])[feature_columns]
-                pred_idx = model.predict(input_df).flatten()[0]
-                pred_label = le.inverse_transform([int(pred_idx)])[0]
-                insights['predicted_class'] = str(pred_label)
+            # Older blobs list only the classes seen in training, alphabetically,
+            # which is exactly their LabelEncoder's code order
+            class_names = model_data.get('class_names', ENGAGEMENT_CLASSES)
+
+            input_arr = _input_row(model_data)
+            pred_idx = int(model.predict(input_arr, prediction_type='Class').flatten()[0])
+            insights['predicted_class'] = str(class_names[pred_idx])
     except Exception:
         insights['predicted_class'] = None
 
     # 4c. Average Reach (Historical)
     insights['predicted_reach'] = 0
-    reach_col = None
-    for col in filtered.columns:
-        if col.lower() == 'reach':
-            reach_col = col
-            break
+    reach_col = cols.reach
 
     if reach_col:
         valid_reach = pd.to_numeric(filtered[reach_col], errors='coerce').dropna()
@@ -417,42 +754,57 @@ def get_insights(df, platform='', content_type=''):
 
     # 5. Engagement Distribution
     if eng_col:
-        engagement_vals = pd.to_numeric(filtered[eng_col], errors='coerce').dropna()
-        dist = {}
-        for val in engagement_vals:
-            bucket = int(val // 2) * 2
-            key = f"{bucket}-{bucket + 2}%"
-            dist[key] = dist.get(key, 0) + 1
+        engagement_vals = pd.to_numeric(filtered[eng_col], errors='coerce').to_numpy(dtype=np.float64)
+        engagement_vals = engagement_vals[np.isfinite(engagement_vals)]
+        buckets = (engagement_vals // 2).astype(np.int64).clip(min=0)
+
+        # One bincount over the 2%-wide buckets. A stray huge rate would
+        # make that array enormous, so sparse ranges count the distinct
+        # buckets instead; either way only occupied buckets reach Python
+        if _sparse_keys(buckets):
+            occupied, counts = np.unique(buckets, return_counts=True)
+        else:
+            counts = np.bincount(buckets)
+            occupied = np.flatnonzero(counts)
+            counts = counts[occupied]
 
         insights['engagement_distribution'] = [
-            {'range': k, 'count': v}
-            for k, v in sorted(dist.items(), key=lambda x: x[0])
+            {'range': f"{i * 2}-{i * 2 + 2}%", 'count': int(c)}
+            for i, c in zip(occupied, counts)
         ]
     else:
         insights['engagement_distribution'] = []
 
     # 6. Top Performing Posts
     if eng_col:
-        engagement_numeric = pd.to_numeric(filtered[eng_col], errors='coerce')
-        top_indices = engagement_numeric.nlargest(5).index
-        top_posts = []
-        for idx in top_indices:
-            row = filtered.loc[idx]
-            post = {
-                'platform': str(row.get(platform_col or 'Platform', 'Unknown')),
-                'content_type': str(row.get(ctype_col or 'Content_Type', 'Unknown')),
-                'engagement_rate': round(float(row.get(eng_col, 0)), 2),
+        eng_vals = pd.to_numeric(filtered[eng_col], errors='coerce').to_numpy(dtype=np.float64)
+        top = _top_positions(eng_vals, min(5, int(np.count_nonzero(~np.isnan(eng_vals)))))
+        sub = filtered.iloc[top]
+
+        def _column(col):
+            return sub[col].to_numpy() if col else np.full(len(sub), 'Unknown', dtype=object)
+
+        top_posts = [
+            {
+                'platform': str(p),
+                'content_type': str(c),
+                'engagement_rate': round(float(e), 2),
             }
-            if reach_col:
-                post['reach'] = int(float(row.get(reach_col, 0)))
-            top_posts.append(post)
+            for p, c, e in zip(_column(platform_col), _column(ctype_col), eng_vals[top])
+        ]
+        if reach_col:
+            for post, r in zip(top_posts, sub[reach_col].to_numpy()):
+                post['reach'] = int(float(r))
         insights['top_posts'] = top_posts
     else:
         insights['top_posts'] = []
 
     # 7. Platform Engagement
     if platform_col and eng_col:
-        plat_eng = filtered.groupby(platform_col)[eng_col].mean()
+        plat_eng = _cached(
+            stats, ('plat_eng', platform_key, ctype_key),
+            lambda: filtered.groupby(platform_col, observed=True)[eng_col].mean(),
+        )
         insights['platform_engagement'] = [
             {'platform': str(p), 'engagement': round(float(v), 2)}
             for p, v in plat_eng.items()
@@ -467,41 +819,79 @@ def get_insights(df, platform='', content_type=''):
     return _sanitize_json(insights)
 
 
-def get_dashboard_data(df, platform=None):
-    """Compute aggregated dashboard data for VisionDeck with platform filtering."""
+def get_dashboard_data(df, platform=None, cache_key=None):
+    """
+    Compute aggregated dashboard data for VisionDeck with platform filtering.
+    cache_key works as in get_insights, sharing the same per-dataset entry.
+    """
     # Common column names normalization
-    eng_col = None
-    platform_col = None
-    ctype_col = None
-    date_col = None
-    reach_col = None
-    hashtag_col = None
-    hour_col = None
-    day_col = None
-    caption_len_col = None
-
-    for col in df.columns:
-        c_low = col.lower()
-        if c_low in ['engagement_rate', 'engagement rate', 'engagement']: eng_col = col
-        elif c_low == 'platform': platform_col = col
-        elif c_low in ['content_type', 'content type']: ctype_col = col
-        elif c_low == 'date': date_col = col
-        elif c_low == 'reach': reach_col = col
-        elif c_low in ['hashtags', 'hashtag']: hashtag_col = col
-        elif c_low == 'hour': hour_col = col
-        elif c_low in ['day_of_week', 'day']: day_col = col
-        elif c_low in ['caption_length', 'caption length']: caption_len_col = col
+    cols = _resolve_cols(df)
+    stats = _dataset_stats(df, cols, cache_key)
+    eng_col = cols.eng
+    platform_col = cols.platform
+    ctype_col = cols.ctype
+    date_col = cols.date
+    reach_col = cols.reach
+    hashtag_col = cols.hashtag
+    hour_col = cols.hour
+    day_col = cols.day
+    caption_len_col = cols.caption
 
     # Filter by platform if provided
-    filtered_df = df.copy()
-    if platform and platform_col:
-        filtered_df = filtered_df[filtered_df[platform_col] == platform]
-    
+    filtered_df = df[df[platform_col] == platform] if platform and platform_col else df
+
+    # Aggregates are cached under the filter applied: none, a platform the
+    # dataset has, or _UNMATCHED for any other value (all of which leave an
+    # empty frame), so arbitrary filter strings can't each add an entry
+    if not (platform and platform_col):
+        platform_key = ''
+    elif platform in stats['platforms']:
+        platform_key = platform
+    else:
+        platform_key = _UNMATCHED
+
+    # Both monthly charts come from one groupby over the parsed month key,
+    # kept for the last 12 months; dates are only parsed on a cache miss
+    monthly = None
+    if date_col and (eng_col or reach_col):
+        aggs = {}
+        if eng_col:
+            aggs['engagement'] = (eng_col, 'mean')
+        if reach_col:
+            aggs['reach'] = (reach_col, 'sum')
+
+        def _monthly():
+            # Group on an integer year*12 + month key rather than Period
+            # objects; only the 12 kept rows are formatted as 'YYYY-MM'
+            dates = pd.to_datetime(filtered_df[date_col], errors='coerce')
+            month_key = dates.dt.year * 12 + (dates.dt.month - 1)
+            out = filtered_df.groupby(month_key).agg(**aggs).sort_index().tail(12)
+            out.index = [f"{int(k) // 12:04d}-{int(k) % 12 + 1:02d}" for k in out.index]
+            return out
+
+        monthly = _cached(stats, ('dash_monthly', platform_key), _monthly)
+
     result = {}
 
     # 1. PIE CHART: Engagement Rate by Content Type
     if ctype_col and eng_col:
-        ct_eng = filtered_df.groupby(ctype_col)[eng_col].mean()
+        if platform and platform_col:
+            # Engagement sums and counts per (platform, content type), taken
+            # in one pass over the whole frame; the pie for every platform
+            # filter is read off this small table
+            two_way = _cached(
+                stats, 'dash_platform_ct_eng',
+                lambda: df.groupby([platform_col, ctype_col], observed=True)[eng_col].agg(['sum', 'count']),
+            )
+            part = two_way[two_way.index.get_level_values(0) == platform].droplevel(0)
+            ct_eng = part['sum'] / part['count']
+        else:
+            # Unfiltered, straight from the content type so rows without a
+            # platform still count
+            ct_eng = _cached(
+                stats, ('dash_ct_eng', platform_key),
+                lambda: filtered_df.groupby(ctype_col, observed=True)[eng_col].mean(),
+            )
         result['pieData'] = [{'name': str(k), 'value': round(float(v), 2)} for k, v in ct_eng.items()]
     else:
         result['pieData'] = []
@@ -509,7 +899,10 @@ def get_dashboard_data(df, platform=None):
     # 2. VERTICAL BAR CHART: Engagement Rate by Day of Week
     if day_col and eng_col:
         day_map = {0: 'Mon', 1: 'Tue', 2: 'Wed', 3: 'Thu', 4: 'Fri', 5: 'Sat', 6: 'Sun'}
-        day_eng = filtered_df.groupby(day_col)[eng_col].mean().sort_index()
+        day_eng = _cached(
+            stats, ('dash_day_eng', platform_key),
+            lambda: _group_means(filtered_df[day_col], filtered_df[eng_col], 7).sort_index(),
+        )
         result['dayBarData'] = [
             {'day': day_map.get(int(k), str(k)), 'engagement': round(float(v), 2)}
             for k, v in day_eng.items()
@@ -519,33 +912,21 @@ def get_dashboard_data(df, platform=None):
 
     # 3. LINE CHART: Engagement Rate by Month (last 12 months)
     if date_col and eng_col:
-        df_copy = filtered_df.copy()
-        df_copy['dt'] = pd.to_datetime(df_copy[date_col], errors='coerce')
-        df_copy = df_copy.dropna(subset=['dt'])
-        df_copy['month_key'] = df_copy['dt'].dt.to_period('M')
-        
-        month_eng = df_copy.groupby('month_key')[eng_col].mean().reset_index()
-        month_eng = month_eng.sort_values('month_key').tail(12)
-        
         result['lineData'] = [
-            {'date': str(row['month_key']), 'engagement': round(float(row[eng_col]), 2)}
-            for _, row in month_eng.iterrows()
+            {'date': str(k), 'engagement': round(float(v), 2)}
+            for k, v in monthly['engagement'].items()
         ]
     else:
         result['lineData'] = []
 
+    # Explode hashtags once; the reach chart and the topHashtag KPI share it
+    hashtag_tokens = _hashtag_tokens(filtered_df[hashtag_col]) if hashtag_col else None
+
     # 4. HISTOGRAM -> BAR CHART: Average Reach by Top Hashtags
     if hashtag_col and reach_col:
-        hashtag_df = filtered_df[[hashtag_col, reach_col]].copy()
-        hashtag_df[hashtag_col] = hashtag_df[hashtag_col].astype(str)
-        hashtag_df = hashtag_df.assign(
-            **{hashtag_col: hashtag_df[hashtag_col].str.split(r'[\s,]+')}
-        ).explode(hashtag_col)
-        
-        hashtag_df[hashtag_col] = hashtag_df[hashtag_col].str.strip()
-        hashtag_df = hashtag_df[hashtag_df[hashtag_col] != '']
-
-        hash_reach = hashtag_df.groupby(hashtag_col)[reach_col].mean().sort_values(ascending=False).head(10)
+        token_reach = filtered_df[reach_col].reindex(hashtag_tokens.index)
+        hash_reach = token_reach.groupby(hashtag_tokens.to_numpy()).mean()
+        hash_reach = hash_reach.iloc[_top_positions(hash_reach.to_numpy(dtype=np.float64), 10)]
         result['hashtagData'] = [
             {'hashtag': str(k), 'reach': int(v)}
             for k, v in hash_reach.items()
@@ -555,24 +936,16 @@ def get_dashboard_data(df, platform=None):
 
     # 5. AREA CHART: Total Reach Over Time (Month-wise, last 12 months)
     if date_col and reach_col:
-        df_copy = filtered_df.copy()
-        df_copy['dt'] = pd.to_datetime(df_copy[date_col], errors='coerce')
-        df_copy = df_copy.dropna(subset=['dt'])
-        df_copy['month_key'] = df_copy['dt'].dt.to_period('M')
-        
-        reach_by_month = df_copy.groupby('month_key')[reach_col].sum().reset_index()
-        reach_by_month = reach_by_month.sort_values('month_key').tail(12)
-        
         result['areaData'] = [
-            {'date': str(row['month_key']), 'reach': int(row[reach_col])}
-            for _, row in reach_by_month.iterrows()
+            {'date': str(k), 'reach': int(v)}
+            for k, v in monthly['reach'].items()
         ]
     else:
         result['areaData'] = []
 
     # 6. BAR CHART: Posts by Hour of Day
     if hour_col:
-        hour_counts = filtered_df[hour_col].value_counts().sort_index()
+        hour_counts = _key_counts(filtered_df[hour_col])
         result['hourData'] = [
             {'hour': f"{int(k)}:00", 'posts': int(v)}
             for k, v in hour_counts.items()
@@ -582,36 +955,26 @@ def get_dashboard_data(df, platform=None):
 
     # 7. SCATTER CHART: Reach vs Engagement Rate
     if reach_col and eng_col:
-        sample_df = filtered_df.sample(n=min(100, len(filtered_df)), random_state=42)
+        # Evenly spaced rows: deterministic and avoids an N-sized permutation
+        n = min(100, len(filtered_df))
+        idx = np.linspace(0, len(filtered_df) - 1, n, dtype=np.int64)
+        sample_df = filtered_df.iloc[idx]
         result['scatterData'] = [
-            {'reach': int(row[reach_col]), 'engagement': round(float(row[eng_col]), 2)}
-            for _, row in sample_df.iterrows()
+            {'reach': int(r), 'engagement': round(float(e), 2)}
+            for r, e in zip(sample_df[reach_col].to_numpy(), sample_df[eng_col].to_numpy())
         ]
     else:
         result['scatterData'] = []
 
     # 8. BAR CHART: Engagement Rate by Caption Length Category
     if caption_len_col and eng_col:
-        temp_df = filtered_df[[caption_len_col, eng_col]].copy()
-        
-        def get_len_cat(x):
-            try:
-                val = float(x)
-                if val < 50: return 'Short'
-                elif val <= 150: return 'Medium'
-                else: return 'Long'
-            except:
-                return 'Medium'
-
-        temp_df['Length_Cat'] = temp_df[caption_len_col].apply(get_len_cat)
-        len_eng = temp_df.groupby('Length_Cat')[eng_col].mean()
+        cap_vals = pd.to_numeric(filtered_df[caption_len_col], errors='coerce').fillna(100).to_numpy()
         order = ['Short', 'Medium', 'Long']
-        result['captionData'] = []
-        for cat in order:
-            if cat in len_eng:
-                result['captionData'].append({'category': cat, 'engagement': round(float(len_eng[cat]), 2)})
-        
-        del temp_df
+        _, len_means, len_counts = _bucket_means(_three_way_bins(cap_vals, 50, 150), filtered_df[eng_col], 3)
+        result['captionData'] = [
+            {'category': cat, 'engagement': round(float(len_means[i]), 2)}
+            for i, cat in enumerate(order) if len_counts[i]
+        ]
     else:
         result['captionData'] = []
 
@@ -629,18 +992,16 @@ def get_dashboard_data(df, platform=None):
         kpis['avgEngagement'] = 0
 
     if hashtag_col:
-        hashtag_series = filtered_df[hashtag_col].astype(str).str.split(r'[\s,]+').explode()
-        hashtag_series = hashtag_series[hashtag_series.str.strip() != '']
-        hashtag_counts = hashtag_series.value_counts()
+        hashtag_counts = hashtag_tokens.value_counts()
         kpis['topHashtag'] = str(hashtag_counts.index[0]) if len(hashtag_counts) > 0 else 'N/A'
     else:
         kpis['topHashtag'] = 'N/A'
 
     if hour_col and eng_col:
-        hour_eng = filtered_df.groupby(hour_col)[eng_col].mean()
-        if len(hour_eng) > 0:
-            peak = hour_eng.idxmax()
-            kpis['peakTime'] = f"{int(peak)}:00"
+        hours, hour_means, hour_counts = _bucket_means(filtered_df[hour_col], filtered_df[eng_col], minlength=24)
+        if hour_counts.any():
+            peak = int(hours[np.where(hour_counts > 0, hour_means, -np.inf).argmax()])
+            kpis['peakTime'] = f"{peak}:00"
         else:
             kpis['peakTime'] = 'N/A'
     else:
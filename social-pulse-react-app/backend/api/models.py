@@ -2,8 +2,10 @@
 Models for Social Pulse API.
 Custom User, Dataset, PreprocessingLog, EDAHistory, MLModel.
 """
+import json
 import uuid
-from django.db import models
+import zlib
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 
 
@@ -35,12 +37,35 @@ class Dataset(models.Model):
 
     class Meta:
         ordering = ['-uploaded_at']
+        # Enforced by the database only where partial unique indexes exist
+        # (SQLite, PostgreSQL); MySQL/TiDB skip it (models.W036), so save()
+        # below is what keeps one dataset active there
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(is_active=True),
+                name='one_active_dataset_per_user',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'is_active'], name='dataset_user_active_idx'),
+        ]
 
     def save(self, *args, **kwargs):
-        # Ensure only one active dataset per user
-        if self.is_active:
-            Dataset.objects.filter(user=self.user, is_active=True).exclude(pk=self.pk).update(is_active=False)
-        super().save(*args, **kwargs)
+        # Ensure only one active dataset per user (skipped for narrow
+        # saves that don't touch is_active)
+        update_fields = kwargs.get('update_fields')
+        if self.is_active and (update_fields is None or 'is_active' in update_fields):
+            # Deactivate and save together, so the one-active constraint
+            # never sees two active rows and readers never see none. The
+            # user row lock serializes concurrent activations for a user,
+            # so two of them can't both commit an active dataset
+            with transaction.atomic():
+                User.objects.select_for_update().filter(pk=self.user_id).exists()
+                Dataset.objects.filter(user=self.user, is_active=True).exclude(pk=self.pk).update(is_active=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.original_filename} ({self.user.email})"
@@ -65,11 +90,24 @@ class EDAHistory(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE, related_name='eda_reports')
     report_json = models.JSONField(default=dict)
+    # zlib-compressed JSON; reports saved before it was added keep report_json
+    report_blob = models.BinaryField(null=True, blank=True, editable=False)
     generated_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-generated_at']
 
+    @staticmethod
+    def compress_report(report):
+        return zlib.compress(json.dumps(report).encode(), 6)
+
+    @property
+    def report(self):
+        """The report dict, from report_blob when present."""
+        if self.report_blob:
+            return json.loads(zlib.decompress(self.report_blob))
+        return self.report_json
+
     def __str__(self):
         return f"EDA for {self.dataset.original_filename} at {self.generated_at}"
 
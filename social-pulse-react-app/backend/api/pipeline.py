@@ -3,11 +3,60 @@ Data preprocessing pipeline for Social Pulse.
 Handles CSV cleaning, null handling, date parsing, and standardization.
 """
 import os
+import json
 import pandas as pd
 import numpy as np
 from django.conf import settings
 
 
+# Column types handed to the pyarrow CSV reader, matched case-insensitively.
+# Date/Time stay text so the parsing steps below see the same strings the
+# pandas parser would give them.
+CSV_COLUMN_TYPES = {
+    'likes': 'int32', 'comments': 'int32', 'shares': 'int32', 'saves': 'int32',
+    'reach': 'int64', 'caption_length': 'int16', 'hashtag_count': 'int8',
+    'hour': 'int8', 'day_of_week': 'int8',
+    'date': 'string', 'time': 'string',
+}
+
+
+def _arrow_convert_options(pacsv, **kwargs):
+    """pyarrow ConvertOptions whose null markers match pandas' default na_values."""
+    null_values = list(pacsv.ConvertOptions().null_values) + ['None', '<NA>']
+    return pacsv.ConvertOptions(null_values=null_values, strings_can_be_null=True, **kwargs)
+
+
+def read_csv(file_path, usecols=None):
+    """
+    Read a CSV into a DataFrame with the multithreaded pyarrow reader and a
+    typed schema for the known columns. Falls back to pd.read_csv when
+    pyarrow is unavailable or a value doesn't fit the declared type.
+    usecols limits parsing to those columns.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(file_path, usecols=usecols)
+
+    header = pd.read_csv(file_path, nrows=0).columns
+    column_types = {
+        col: pa.type_for_alias(CSV_COLUMN_TYPES[col.strip().lower()])
+        for col in header if col.strip().lower() in CSV_COLUMN_TYPES
+    }
+    try:
+        table = pacsv.read_csv(
+            file_path,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=_arrow_convert_options(
+                pacsv, column_types=column_types, include_columns=usecols or [],
+            ),
+        )
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return pd.read_csv(file_path, usecols=usecols)
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
 def preprocess_csv(file_path, options=None):
     """
     Preprocess a raw social media CSV file.
@@ -22,7 +71,7 @@ def preprocess_csv(file_path, options=None):
     if options is None:
         options = {}
 
-    df = pd.read_csv(file_path)
+    df = read_csv(file_path)
     original_rows = len(df)
     cleaning_steps = []
 
@@ -45,14 +94,13 @@ def preprocess_csv(file_path, options=None):
 
     # ─── Step 3: Extract Time features ───
     if 'Time' in df.columns:
-        try:
-            time_series = pd.to_datetime(df['Time'], format='%H:%M', errors='coerce')
-            df['Hour'] = time_series.dt.hour
-            if df['Hour'].isna().all():
-                df['Hour'] = pd.to_numeric(df['Time'], errors='coerce')
-            cleaning_steps.append('extract_hour')
-        except Exception:
-            df['Hour'] = pd.to_numeric(df['Time'], errors='coerce')
+        # The hour is whatever precedes the first ':', so "14:30" and a bare
+        # "14" parse alike; anything outside 0-23 becomes missing
+        hours = pd.to_numeric(
+            df['Time'].astype('string').str.split(':', n=1, expand=True)[0], errors='coerce',
+        )
+        df['Hour'] = np.floor(hours.where(hours.between(0, 23))).astype('Int8')
+        cleaning_steps.append('extract_hour')
     elif 'hour' in df.columns:
         df['Hour'] = pd.to_numeric(df['hour'], errors='coerce')
 
@@ -75,10 +123,15 @@ def preprocess_csv(file_path, options=None):
             df = df.dropna(subset=critical_cols)
             cleaning_steps.append('drop_null_targets')
 
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_cols:
-            if df[col].isna().any():
-                df[col] = df[col].fillna(df[col].median())
+        # One median pass and one fill over the whole numeric block; fillna
+        # is a no-op on columns without gaps
+        num_block = df.select_dtypes(include=[np.number])
+        if len(num_block.columns):
+            medians = num_block.median()
+            # Nullable integer columns (e.g. Hour) can't hold a .5 median
+            int_cols = [col for col in num_block.columns if pd.api.types.is_integer_dtype(num_block[col])]
+            medians[int_cols] = medians[int_cols].round()
+            df[num_block.columns] = num_block.fillna(medians)
         cleaning_steps.append('fill_median')
 
     # ─── Step 6: Deduplicate ───
@@ -93,25 +146,21 @@ def preprocess_csv(file_path, options=None):
         'Likes', 'Comments', 'Shares', 'Saves', 'Reach',
         'Engagement_Rate', 'Caption_Length', 'Hashtag_count'
     ]
-    for col in numeric_columns:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    present = [col for col in numeric_columns if col in df.columns]
+    if present:
+        df[present] = df[present].apply(pd.to_numeric, errors='coerce').fillna(0)
 
     # ─── Step 8: Calculate Engagement Rate if missing ───
     # Engagement Rate = ((Likes + Comments + Shares + Saves) / Reach) * 100
     if 'Engagement_Rate' not in df.columns and 'Reach' in df.columns:
-        # Check if we have interaction columns
-        interactions = df['Likes'] if 'Likes' in df.columns else 0
-        if 'Comments' in df.columns:
-            interactions += df['Comments']
-        if 'Shares' in df.columns:
-            interactions += df['Shares']
-        if 'Saves' in df.columns:
-            interactions += df['Saves']
-        
-        # Calculate
-        df['Engagement_Rate'] = (interactions / df['Reach']) * 100
-        df['Engagement_Rate'] = df['Engagement_Rate'].fillna(0).replace([float('inf'), -float('inf')], 0)
+        # One row-sum over whichever interaction columns exist
+        interaction_cols = [col for col in ['Likes', 'Comments', 'Shares', 'Saves'] if col in df.columns]
+        interactions = df[interaction_cols].to_numpy(dtype=np.float64).sum(axis=1)
+        reach = df['Reach'].to_numpy(dtype=np.float64)
+
+        # Zero reach would give NaN/inf; report those rows as 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['Engagement_Rate'] = np.where(reach != 0, interactions / reach * 100, 0.0)
         cleaning_steps.append('calculate_engagement')
 
     # ─── Save processed file ───
@@ -125,12 +174,10 @@ def preprocess_csv(file_path, options=None):
     processed_path = os.path.join(processed_dir, processed_name)
 
     df.to_csv(processed_path, index=False)
+    _write_parquet_sidecar(df, processed_path)
 
     # ─── Build preview data ───
-    preview_df = df.head(10).copy()
-    for col in preview_df.select_dtypes(include=['datetime64']).columns:
-        preview_df[col] = preview_df[col].astype(str)
-    preview_data = preview_df.fillna('').to_dict(orient='records')
+    preview_data = preview_records(df.head(10))
 
     # ─── Data health calculation ───
     total_cells = df.shape[0] * df.shape[1]
@@ -155,32 +202,188 @@ def preprocess_csv(file_path, options=None):
     }
 
 
+def preview_records(df):
+    """
+    Rows of a (small) frame as the list of dicts the preview tables use.
+    Cells go through pandas' C JSON encoder rather than being boxed one by
+    one by to_dict; datetimes keep their str() form, missing cells are ''.
+    """
+    df = df.copy()
+    for col in df.select_dtypes(include=['datetime64']).columns:
+        df[col] = df[col].astype(str)
+    # Nullable columns (the Int8 Hour, Arrow-backed dtypes) refuse '' as a
+    # fill value, so box them first
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.api.extensions.ExtensionDtype):
+            df[col] = df[col].astype(object)
+    return json.loads(df.fillna('').to_json(orient='records', double_precision=15))
+
+
 def get_data_preview(file_path, n_rows=5):
     """Read a CSV and return first N rows as list of dicts."""
     try:
         df = pd.read_csv(file_path, nrows=n_rows)
-        for col in df.select_dtypes(include=['datetime64']).columns:
-            df[col] = df[col].astype(str)
-        return df.fillna('').to_dict(orient='records'), list(df.columns)
+        return preview_records(df), list(df.columns)
     except Exception:
         return [], []
 
 
-def get_full_dataframe(file_path):
-    """Load and return a full DataFrame from CSV."""
-    return pd.read_csv(file_path)
+CATEGORICAL_COLUMNS = ('platform', 'content_type', 'content type')
 
 
-def compute_data_health(file_path):
-    """Compute data health metrics for a CSV file."""
-    df = pd.read_csv(file_path)
-    total_cells = df.shape[0] * df.shape[1]
-    null_count = int(df.isna().sum().sum())
+def _coerce_categoricals(df):
+    """
+    Convert low-cardinality label columns (Platform, Content_Type) to the
+    pandas 'category' dtype so groupby and get_dummies work on integer codes.
+    """
+    for col in df.columns:
+        if str(col).lower() in CATEGORICAL_COLUMNS and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+
+def _parquet_sidecar_path(file_path):
+    return os.path.splitext(file_path)[0] + '.parquet'
+
+
+def _fresh_parquet_path(file_path):
+    """The Parquet file to read for file_path: itself, a sidecar at least as new, or None."""
+    if file_path.endswith('.parquet'):
+        return file_path
+    sidecar = _parquet_sidecar_path(file_path)
+    if os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(file_path):
+        return sidecar
+    return None
+
+
+def _write_parquet_sidecar(df, file_path):
+    """
+    Save a Parquet copy of a processed CSV with the label columns as
+    categoricals, so reloads keep the dtypes. Best effort: columns pyarrow
+    can't serialise (mixed object types) just leave the CSV on its own.
+    """
+    sidecar = _parquet_sidecar_path(file_path)
+    try:
+        _coerce_categoricals(df.copy(deep=False)).to_parquet(
+            sidecar, engine='pyarrow', compression='snappy', index=False,
+        )
+    except Exception:
+        if os.path.exists(sidecar):
+            os.remove(sidecar)
+
+
+def read_parquet(file_path, columns=None):
+    """Read a Parquet file through a memory map, releasing Arrow buffers as columns convert."""
+    import pyarrow.parquet as pq
+    table = pq.read_table(file_path, columns=columns, memory_map=True)
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+def _column_names(file_path):
+    """Column names of a Parquet file (from its footer) or a CSV (from its header)."""
+    if file_path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(file_path).names)
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+
+def get_full_dataframe_from_parquet(source):
+    """Load a DataFrame from Parquet (a path or file-like), label columns as categoricals."""
+    return _coerce_categoricals(pd.read_parquet(source))
+
+
+def get_full_dataframe(file_path, select=None):
+    """
+    Load and return a full DataFrame. Accepts a .parquet path directly; for
+    a CSV, prefers its Parquet sidecar when that is at least as new.
+    select, if given, is called with the file's column names and returns
+    the ones to load; the others are never parsed.
+    """
+    def columns_of(path):
+        return select(_column_names(path)) if select else None
+
+    if file_path.endswith('.parquet'):
+        return _coerce_categoricals(read_parquet(file_path, columns_of(file_path)))
+
+    sidecar = _fresh_parquet_path(file_path)
+    if sidecar:
+        try:
+            return _coerce_categoricals(read_parquet(sidecar, columns_of(sidecar)))
+        except Exception:
+            pass
+    return _coerce_categoricals(read_csv(file_path, usecols=columns_of(file_path)))
+
+
+def get_distinct_values(file_path, column_groups):
+    """
+    Sorted distinct non-null values of the first present column in each
+    group of candidate names, e.g. (('Platform', 'platform'),). Only those
+    columns are read, from the Parquet copy when there is a fresh one.
+    Returns one list per group ([] when none of its names exist).
+    """
+    parquet = _fresh_parquet_path(file_path)
+    available = set(_column_names(parquet or file_path))
+
+    picked = [next((col for col in group if col in available), None) for group in column_groups]
+    wanted = [col for col in picked if col]
+    if not wanted:
+        return [[] for _ in column_groups]
+
+    if parquet:
+        df = pd.read_parquet(parquet, columns=wanted)
+    else:
+        df = read_csv(file_path, usecols=wanted)
+    return [sorted(df[col].dropna().unique().tolist()) if col else [] for col in picked]
+
+
+def compute_data_health(file_path, chunksize=100_000):
+    """
+    Compute data health metrics for a CSV file. Streams the file in record
+    batches and keeps only running row/null counts, so memory stays flat
+    regardless of file size.
+    """
+    columns = pd.read_csv(file_path, nrows=0).columns
+    total_rows = 0
+    null_count = 0
+
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        pacsv = None
+
+    if pacsv is not None:
+        # Read every column as text: only nullness matters here, and fixed
+        # types can't be contradicted by a later batch. Quoted values may
+        # span lines (captions), which the block splitter must allow for.
+        try:
+            reader = pacsv.open_csv(
+                file_path,
+                parse_options=pacsv.ParseOptions(newlines_in_values=True),
+                convert_options=_arrow_convert_options(
+                    pacsv, column_types={col: pa.string() for col in columns},
+                ),
+            )
+            for batch in reader:
+                total_rows += batch.num_rows
+                null_count += sum(col.null_count for col in batch.columns)
+        except pa.ArrowInvalid:
+            # Rows pyarrow can't parse (e.g. ragged lines): recount with pandas
+            pacsv = None
+            total_rows = null_count = 0
+
+    if pacsv is None:
+        for chunk in pd.read_csv(file_path, chunksize=chunksize):
+            total_rows += len(chunk)
+            null_count += int(chunk.isna().sum().sum())
+
+    total_columns = len(columns)
+    total_cells = total_rows * total_columns
     health = round(((total_cells - null_count) / total_cells * 100), 1) if total_cells > 0 else 0
 
     return {
         'percentage': health,
-        'totalRows': len(df),
-        'totalColumns': len(df.columns),
+        'totalRows': total_rows,
+        'totalColumns': total_columns,
         'nullCount': null_count,
     }
@@ -0,0 +1,53 @@
+"""
+orjson-backed JSON parser and renderer for the Social Pulse API.
+Drop-in replacements for DRF's JSONParser/JSONRenderer that fall back to
+them when orjson is not installed.
+"""
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Types orjson doesn't know (lazy strings, Decimal, QuerySets, ...) go
+# through DRF's encoder, so responses match the stock renderer
+_default = JSONEncoder().default
+
+
+class OrjsonParser(JSONParser):
+    """Parse JSON request bodies with orjson (strict: NaN/Infinity are rejected)."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    Render responses with orjson. NaN and Infinity become null, NumPy
+    scalars and arrays serialize directly, and any requested indent
+    (e.g. from the browsable API) renders as orjson's two-space indent.
+    Datetimes come out as DRF's encoder writes them, UTC as 'Z'.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
@@ -79,6 +79,8 @@ class ProcessOptionsSerializer(serializers.Serializer):
 # ── EDA Serializers ──
 
 class EDAHistorySerializer(serializers.ModelSerializer):
+    report_json = serializers.JSONField(source='report', read_only=True)
+
     class Meta:
         model = EDAHistory
         fields = ['id', 'report_json', 'generated_at']
@@ -99,6 +101,8 @@ class TrainRequestSerializer(serializers.Serializer):
         choices=['regression', 'classification', 'both'],
         default='both'
     )
+    # Return a job id at once and train in the background
+    background = serializers.BooleanField(required=False, default=False)
 
 
 class InsightsRequestSerializer(serializers.Serializer):
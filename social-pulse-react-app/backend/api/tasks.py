@@ -0,0 +1,145 @@
+"""
+Background jobs for Social Pulse.
+Runs model training off the request thread. Job state is kept in the Django
+cache, so any worker sharing the cache backend can report on it.
+"""
+import gc
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.db import connection
+
+from .models import MLModel
+from .ml_engine import prepare_features, train_lightgbm, train_catboost, training_threads
+
+
+# How long finished job results stay retrievable (seconds)
+JOB_TTL = 24 * 60 * 60
+
+# One training at a time per process; both trainers already use every core
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='training')
+
+
+def _train_regression(dataset, df, features, n_jobs):
+    result = train_lightgbm(df, features, n_jobs)
+    record = MLModel(
+        dataset=dataset,
+        model_type=MLModel.ModelType.REGRESSION_LGBM,
+        model_file=result['model_relative'],
+        metrics=result['metrics'],
+        feature_columns=result['feature_columns'],
+    )
+    return record, {
+        'title': 'LightGBM Regression',
+        'subtitle': 'Predict Engagement Rate',
+        'metrics': result['metrics'],
+        'feature_columns': result['feature_columns'],
+        'training_samples': result['training_samples'],
+        'test_samples': result['test_samples'],
+    }
+
+
+def _train_classification(dataset, df, features, n_jobs):
+    result = train_catboost(df, features, n_jobs)
+    record = MLModel(
+        dataset=dataset,
+        model_type=MLModel.ModelType.CLASSIFICATION_CATBOOST,
+        model_file=result['model_relative'],
+        metrics=result['metrics'],
+        feature_columns=result['feature_columns'],
+    )
+    return record, {
+        'title': 'CatBoost Classification',
+        'subtitle': 'Predict Engagement Category',
+        'metrics': result['metrics'],
+        'feature_columns': result['feature_columns'],
+        'class_names': result['class_names'],
+        'training_samples': result['training_samples'],
+        'test_samples': result['test_samples'],
+    }
+
+
+# Result key and trainer for each model a training request can ask for
+_TRAINERS = {
+    'regression': _train_regression,
+    'classification': _train_classification,
+}
+
+
+def train_models(dataset, df, model_type):
+    """
+    Train the requested models on df, record them against the dataset and
+    return the per-model results shown by the training endpoint.
+    With model_type 'both' the two trainers run at the same time and split
+    the training threads between them, so the wait is the slower of the two.
+    """
+    names = list(_TRAINERS) if model_type == 'both' else [model_type]
+
+    # Both trainers use the same feature matrix; build it once
+    features = prepare_features(df) if len(names) > 1 else None
+    # Share every training thread out; an odd one goes to the first trainer
+    total = training_threads()
+    n_jobs = [max(1, total // len(names) + (i < total % len(names))) for i in range(len(names))]
+
+    # The trainers spend their time in native code with the GIL released
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix='trainer') as pool:
+        futures = {
+            name: pool.submit(_TRAINERS[name], dataset, df, features, threads)
+            for name, threads in zip(names, n_jobs)
+        }
+
+    results = {}
+    trained = []
+    for name, future in futures.items():
+        try:
+            record, results[name] = future.result()
+            trained.append(record)
+        except Exception as e:
+            results[name] = {'error': str(e)}
+
+    # Record every trained model in one upsert on (dataset, model_type).
+    # MySQL/TiDB's ON DUPLICATE KEY UPDATE takes no conflict target (it
+    # matches any unique key), and Django rejects unique_fields there
+    if trained:
+        target = ['dataset', 'model_type'] if connection.features.supports_update_conflicts_with_target else None
+        MLModel.objects.bulk_create(
+            trained,
+            update_conflicts=True,
+            unique_fields=target,
+            update_fields=['model_file', 'metrics', 'feature_columns', 'trained_at'],
+        )
+
+    del features
+    gc.collect()
+    return results
+
+
+def _job_key(job_id):
+    return f"training_job:{job_id}"
+
+
+def get_job(job_id):
+    """Return the stored state of a training job, or None if unknown/expired."""
+    return cache.get(_job_key(job_id))
+
+
+def submit_training(dataset, df, model_type, user_id):
+    """Queue train_models on the background executor and return its job id."""
+    job_id = uuid.uuid4().hex
+    cache.set(_job_key(job_id), {'state': 'PENDING', 'user_id': user_id}, JOB_TTL)
+    _EXECUTOR.submit(_run_training_job, job_id, dataset, df, model_type, user_id)
+    return job_id
+
+
+def _run_training_job(job_id, dataset, df, model_type, user_id):
+    key = _job_key(job_id)
+    cache.set(key, {'state': 'STARTED', 'user_id': user_id}, JOB_TTL)
+    try:
+        results = train_models(dataset, df, model_type)
+        cache.set(key, {'state': 'SUCCESS', 'user_id': user_id, 'results': results}, JOB_TTL)
+    except Exception as e:
+        cache.set(key, {'state': 'FAILURE', 'user_id': user_id, 'error': str(e)}, JOB_TTL)
+    finally:
+        # This thread opened its own DB connection; don't leak it
+        connection.close()
@@ -0,0 +1,124 @@
+"""
+Output parity for get_insights/get_dashboard_data on the sample CSVs under
+media/. data/baseline_outputs.json holds what the original implementation
+(pd.read_csv, no caching) returned for each file, unfiltered and filtered
+on the platform/content type of its first row, with no trained models.
+"""
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from api import ml_engine
+from api.ml_engine import analysis_columns, get_dashboard_data, get_insights
+from api.pipeline import get_full_dataframe
+
+with open(os.path.join(os.path.dirname(__file__), 'data', 'baseline_outputs.json')) as f:
+    BASELINE = json.load(f)
+
+
+def _column(df, name):
+    return next(col for col in df.columns if col.lower() == name)
+
+
+def _bucket_start(entry):
+    return int(entry['range'].split('-')[0])
+
+
+class ParityTests(SimpleTestCase):
+
+    def setUp(self):
+        # No trained models, as when the baseline outputs were recorded
+        models = tempfile.TemporaryDirectory()
+        self.addCleanup(models.cleanup)
+        media = override_settings(MEDIA_ROOT=models.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        ml_engine.DATASET_CACHE.clear()
+
+    def loaders(self, path):
+        # The baseline's plain read, and the column-narrowed load the views use
+        yield 'read_csv', pd.read_csv(path)
+        yield 'get_full_dataframe', get_full_dataframe(path, select=analysis_columns)
+
+    def assertDashboardMatches(self, actual, expected, n_rows):
+        # The scatter used to be a random sample; it is now evenly spaced rows
+        self.assertEqual(len(actual.pop('scatterData')), min(100, n_rows))
+        self.assertEqual(actual, expected)
+
+    def assertInsightsMatch(self, actual, expected):
+        # Same buckets, now in numeric rather than string order
+        dist = actual.pop('engagement_distribution')
+        self.assertEqual(dist, sorted(dist, key=_bucket_start))
+        self.assertCountEqual(dist, expected.pop('engagement_distribution'))
+        self.assertEqual(actual, expected)
+
+    def check(self, df, expected, cache_key=None):
+        platform, content_type = expected['platform'], expected['content_type']
+        self.assertDashboardMatches(get_dashboard_data(df, cache_key=cache_key), dict(expected['dashboard']), len(df))
+        self.assertDashboardMatches(
+            get_dashboard_data(df, platform=platform, cache_key=cache_key),
+            dict(expected['dashboard_platform']), int((df[_column(df, 'platform')] == platform).sum()),
+        )
+        self.assertInsightsMatch(get_insights(df, cache_key=cache_key), dict(expected['insights']))
+        self.assertInsightsMatch(
+            get_insights(df, platform, content_type, cache_key=cache_key), dict(expected['insights_filtered']),
+        )
+
+    def test_matches_baseline(self):
+        for name, expected in BASELINE.items():
+            path = os.path.join(settings.BASE_DIR, 'media', name)
+            for loader, df in self.loaders(path):
+                with self.subTest(name=name, loader=loader):
+                    self.check(df, expected)
+                    # Twice through the per-dataset cache: the miss, then the hit
+                    self.check(df, expected, cache_key=(name, loader))
+                    self.check(df, expected, cache_key=(name, loader))
+
+    def test_unknown_filters_share_cached_aggregates(self):
+        name, expected = next(iter(BASELINE.items()))
+        df = pd.read_csv(os.path.join(settings.BASE_DIR, 'media', name))
+
+        get_insights(df, cache_key='k')
+        get_dashboard_data(df, platform='No such platform', cache_key='k')
+        cached = len(ml_engine.DATASET_CACHE['k']['aggregates'])
+
+        for i in range(20):
+            insights = get_insights(df, f'platform {i}', f'type {i}', cache_key='k')
+            dashboard = get_dashboard_data(df, platform=f'platform {i}', cache_key='k')
+        self.assertEqual(len(ml_engine.DATASET_CACHE['k']['aggregates']), cached)
+        # Unknown values filter nothing in insights, and everything in the dashboard
+        self.assertInsightsMatch(insights, dict(expected['insights']))
+        self.assertEqual(dashboard['pieData'], [])
+
+    def test_unfiltered_pie_counts_rows_without_platform(self):
+        df = pd.DataFrame({
+            'Platform': ['A', 'A', np.nan, 'B'],
+            'Content_Type': ['video', 'image', 'video', 'video'],
+            'Engagement_Rate': [1.0, 2.0, 10.0, 3.0],
+        })
+        for cache_key in (None, 'pie'):
+            pie = {p['name']: p['value'] for p in get_dashboard_data(df, cache_key=cache_key)['pieData']}
+            self.assertEqual(pie, {'image': 2.0, 'video': round(14 / 3, 2)})
+            pie = {p['name']: p['value'] for p in get_dashboard_data(df, 'A', cache_key=cache_key)['pieData']}
+            self.assertEqual(pie, {'image': 2.0, 'video': 1.0})
+
+    def test_stray_huge_hour(self):
+        # Bincounting by hour would allocate an array the size of the stray value
+        stray = 10 ** 12
+        df = pd.DataFrame({
+            'Platform': ['A'] * 4,
+            'Hour': [3, 3, stray, 5],
+            'Day_of_Week': [1, 2, stray, 2],
+            'Engagement_Rate': [1.0, 2.0, 9.0, 3.0],
+        })
+        dashboard = get_dashboard_data(df)
+        self.assertEqual(dashboard['hourData'], [
+            {'hour': '3:00', 'posts': 2}, {'hour': '5:00', 'posts': 1}, {'hour': f'{stray}:00', 'posts': 1},
+        ])
+        self.assertEqual(dashboard['kpis']['peakTime'], f'{stray}:00')
+        self.assertEqual(get_insights(df)['best_times'][0], {'hour': stray, 'avg_engagement': 9.0})
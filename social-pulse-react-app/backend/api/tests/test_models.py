@@ -0,0 +1,62 @@
+"""
+Tests for the one-active-dataset-per-user invariant kept by Dataset.save.
+"""
+import unittest
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from api.models import Dataset
+
+
+class ActiveDatasetTests(TestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create_user(username='a', email='a@example.com', password='pulse-test-pw')
+        self.other = User.objects.create_user(username='b', email='b@example.com', password='pulse-test-pw')
+
+    def make(self, user, name, is_active=True):
+        dataset = Dataset(user=user, file=f'datasets/{name}', original_filename=name, is_active=is_active)
+        dataset.save()
+        return dataset
+
+    def active(self, user):
+        return list(Dataset.objects.filter(user=user, is_active=True).values_list('original_filename', flat=True))
+
+    def test_new_active_dataset_replaces_previous(self):
+        self.make(self.user, 'first.csv')
+        self.make(self.user, 'second.csv')
+        self.assertEqual(self.active(self.user), ['second.csv'])
+
+    def test_activating_older_dataset(self):
+        first = self.make(self.user, 'first.csv')
+        self.make(self.user, 'second.csv')
+
+        first.is_active = True
+        first.save(update_fields=['is_active'])
+        self.assertEqual(self.active(self.user), ['first.csv'])
+
+    def test_narrow_save_leaves_activation_alone(self):
+        first = self.make(self.user, 'first.csv')
+        self.make(self.user, 'second.csv')
+
+        # first is stale (still is_active=True in memory); a save that
+        # doesn't write is_active must not deactivate anything
+        first.row_count = 10
+        first.save(update_fields=['row_count'])
+        self.assertEqual(self.active(self.user), ['second.csv'])
+
+    def test_other_users_unaffected(self):
+        self.make(self.other, 'theirs.csv')
+        self.make(self.user, 'mine.csv')
+        self.assertEqual(self.active(self.other), ['theirs.csv'])
+        self.assertEqual(self.active(self.user), ['mine.csv'])
+
+    @unittest.skipUnless(connection.features.supports_partial_indexes, 'partial unique indexes unsupported')
+    def test_database_rejects_second_active_dataset(self):
+        self.make(self.user, 'first.csv')
+        self.make(self.user, 'second.csv')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Dataset.objects.filter(user=self.user).update(is_active=True)
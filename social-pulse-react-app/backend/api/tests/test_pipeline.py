@@ -0,0 +1,87 @@
+"""
+Tests for the CSV readers in api.pipeline: the pyarrow paths and their
+pandas fallbacks must agree with a plain pd.read_csv of the same file.
+"""
+import os
+import sys
+import tempfile
+from unittest import mock
+
+import pandas as pd
+from django.test import SimpleTestCase, override_settings
+
+from api.pipeline import compute_data_health, preprocess_csv, read_csv
+
+
+def write_multiline_csv(path, rows):
+    """A CSV whose quoted captions span three lines, with some blank Likes."""
+    with open(path, 'w', newline='') as f:
+        f.write('Platform,Caption,Likes,Reach\n')
+        for i in range(rows):
+            likes = '' if i % 7 == 0 else str(i)
+            f.write(f'Instagram,"{"word " * 40}\n{"more " * 30}\nend {i}",{likes},{i * 10}\n')
+
+
+class CsvReaderTests(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp = tempfile.TemporaryDirectory()
+        # Larger than pyarrow's 1 MB block, so values span block boundaries
+        cls.multiline = os.path.join(cls.tmp.name, 'multiline.csv')
+        write_multiline_csv(cls.multiline, 6000)
+        # Short rows: pandas pads them with NaN, pyarrow rejects them
+        cls.ragged = os.path.join(cls.tmp.name, 'ragged.csv')
+        with open(cls.ragged, 'w') as f:
+            f.write('a,b,c\n1,2,3\n4,5\n6,,9\n')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+        super().tearDownClass()
+
+    def assertHealthMatchesPandas(self, path):
+        df = pd.read_csv(path)
+        health = compute_data_health(path)
+        self.assertEqual(health['totalRows'], len(df))
+        self.assertEqual(health['totalColumns'], len(df.columns))
+        self.assertEqual(health['nullCount'], int(df.isna().sum().sum()))
+
+    def test_multiline_values(self):
+        self.assertGreater(os.path.getsize(self.multiline), 1 << 20)
+        self.assertHealthMatchesPandas(self.multiline)
+        pd.testing.assert_frame_equal(read_csv(self.multiline), pd.read_csv(self.multiline), check_dtype=False)
+
+    def test_unparseable_rows_fall_back_to_pandas(self):
+        self.assertHealthMatchesPandas(self.ragged)
+        pd.testing.assert_frame_equal(read_csv(self.ragged), pd.read_csv(self.ragged), check_dtype=False)
+
+    def test_without_pyarrow(self):
+        # A None entry makes the import raise ImportError; pyarrow itself
+        # stays, since pandas uses it internally
+        with mock.patch.dict(sys.modules, {'pyarrow.csv': None}):
+            for path in (self.multiline, self.ragged):
+                self.assertHealthMatchesPandas(path)
+                pd.testing.assert_frame_equal(read_csv(path), pd.read_csv(path))
+
+
+class PreprocessTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.path = os.path.join(tmp.name, 'posts.csv')
+        with open(self.path, 'w') as f:
+            f.write('Platform,Date,Time,Likes\nX,2024-01-05,14:30,3\nX,2024-01-06,,4\nX,2024-01-07,noon,5\n')
+
+    def test_blank_hours_in_preview(self):
+        # With removeNulls off the Int8 Hour keeps its missing values
+        for options in ({}, {'standardizeDates': True}):
+            with self.subTest(options=options):
+                result = preprocess_csv(self.path, options)
+                self.assertEqual([row['Hour'] for row in result['preview_data']], [14, '', ''])
+                self.assertEqual(result['rows_after'], 3)
@@ -0,0 +1,83 @@
+"""
+Tests for how train_models records trained models. The trainers are
+replaced with fakes so only the bookkeeping around them runs.
+"""
+from unittest import mock
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+
+from api import tasks
+from api.models import Dataset, MLModel
+
+
+def fake_trainer(model_type, run):
+    def train(dataset, df, features, n_jobs):
+        record = MLModel(
+            dataset=dataset,
+            model_type=model_type,
+            model_file=f'models/{model_type}',
+            metrics={'run': run},
+            feature_columns=['Hour'],
+        )
+        return record, {'metrics': record.metrics}
+    return train
+
+
+def failing_trainer(dataset, df, features, n_jobs):
+    raise ValueError('not enough rows')
+
+
+class TrainModelsTests(TestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='a', email='a@example.com', password='pulse-test-pw')
+        self.dataset = Dataset.objects.create(user=user, file='datasets/a.csv', original_filename='a.csv')
+        self.df = pd.DataFrame({'Platform': ['X', 'Y'], 'Hour': [1, 2], 'Engagement_Rate': [1.0, 2.0]})
+
+    def train(self, trainers, model_type='both'):
+        with mock.patch.dict(tasks._TRAINERS, trainers):
+            return tasks.train_models(self.dataset, self.df, model_type)
+
+    def recorded(self):
+        return {m.model_type: m.metrics['run'] for m in MLModel.objects.filter(dataset=self.dataset)}
+
+    def test_retraining_updates_records_in_place(self):
+        regression = MLModel.ModelType.REGRESSION_LGBM
+        classification = MLModel.ModelType.CLASSIFICATION_CATBOOST
+
+        self.train({'regression': fake_trainer(regression, 1), 'classification': fake_trainer(classification, 1)})
+        first_ids = set(MLModel.objects.values_list('id', flat=True))
+
+        results = self.train({'regression': fake_trainer(regression, 2), 'classification': fake_trainer(classification, 2)})
+        self.assertEqual(results['regression']['metrics'], {'run': 2})
+        self.assertEqual(self.recorded(), {regression: 2, classification: 2})
+        self.assertEqual(set(MLModel.objects.values_list('id', flat=True)), first_ids)
+
+    def test_failed_trainer_keeps_previous_record(self):
+        regression = MLModel.ModelType.REGRESSION_LGBM
+        classification = MLModel.ModelType.CLASSIFICATION_CATBOOST
+
+        self.train({'regression': fake_trainer(regression, 1), 'classification': fake_trainer(classification, 1)})
+        results = self.train({'regression': fake_trainer(regression, 2), 'classification': failing_trainer})
+
+        self.assertEqual(results['classification'], {'error': 'not enough rows'})
+        self.assertEqual(self.recorded(), {regression: 2, classification: 1})
+
+    def test_single_model(self):
+        regression = MLModel.ModelType.REGRESSION_LGBM
+        results = self.train({'regression': fake_trainer(regression, 1)}, model_type='regression')
+        self.assertEqual(list(results), ['regression'])
+        self.assertEqual(self.recorded(), {regression: 1})
+
+    def test_no_conflict_target_on_mysql(self):
+        # MySQL/TiDB's ON DUPLICATE KEY UPDATE takes no target, and Django
+        # raises NotSupportedError if unique_fields is passed there
+        regression = MLModel.ModelType.REGRESSION_LGBM
+        with mock.patch.object(connection.features, 'supports_update_conflicts_with_target', False), \
+                mock.patch.object(MLModel.objects, 'bulk_create') as bulk_create:
+            self.train({'regression': fake_trainer(regression, 1)}, model_type='regression')
+        self.assertIsNone(bulk_create.call_args.kwargs['unique_fields'])
+        self.assertTrue(bulk_create.call_args.kwargs['update_conflicts'])
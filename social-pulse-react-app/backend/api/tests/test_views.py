@@ -0,0 +1,76 @@
+"""
+Tests for the dataset endpoints and EDA fallback in api.views.
+"""
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.models import Dataset
+from api.serializers import DatasetSerializer
+from api.views import _manual_eda
+from .test_pipeline import write_multiline_csv
+
+
+class DatasetViewTests(TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        media = override_settings(MEDIA_ROOT=os.path.join(self.tmp, 'media'))
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = get_user_model().objects.create_user(
+            username='analyst', email='analyst@example.com', password='pulse-test-pw',
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, path):
+        with open(path, 'rb') as f:
+            return self.client.post(reverse('upload_dataset'), {'file': f}, format='multipart')
+
+    def test_upload_counts_multiline_rows(self):
+        # Over 2 MB, so the upload is also spooled to a temp file
+        path = os.path.join(self.tmp, 'captions.csv')
+        write_multiline_csv(path, 6000)
+
+        response = self.upload(path)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data['dataHealth']['totalRows'], 6000)
+
+        dataset = Dataset.objects.get(user=self.user)
+        self.assertEqual((dataset.row_count, dataset.column_count), (6000, 4))
+        self.assertEqual(dataset.columns, ['Platform', 'Caption', 'Likes', 'Reach'])
+        self.assertTrue(dataset.is_active)
+
+    def test_dataset_list_matches_serializer(self):
+        # The list is built from .values() and rendered with orjson; it must
+        # read exactly as DRF's renderer writes DatasetSerializer data
+        path = os.path.join(self.tmp, 'small.csv')
+        with open(path, 'w') as f:
+            f.write('Platform,Likes\nX,1\n')
+        self.upload(path)
+        self.upload(path)
+
+        response = self.client.get(reverse('list_datasets'))
+        self.assertEqual(response.status_code, 200)
+        expected = DatasetSerializer(Dataset.objects.filter(user=self.user), many=True).data
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+        self.assertTrue(response.json()[0]['uploaded_at'].endswith('Z'))
+
+
+class ManualEdaTests(SimpleTestCase):
+
+    def test_header_only_csv(self):
+        report = _manual_eda(pd.DataFrame({'Platform': pd.Series(dtype=object), 'Likes': pd.Series(dtype=float)}))
+        self.assertEqual(report['table']['n'], 0)
+        self.assertEqual(report['table']['p_cells_missing'], 0.0)
+        self.assertEqual(report['variables']['Likes']['p_missing'], 0.0)
@@ -25,6 +25,7 @@ urlpatterns = [
 
     # ML Training
     path('train/', views.train_model_view, name='train_model'),
+    path('training/results/<str:job_id>/', views.training_status_view, name='training_status'),
 
     # Insights / Predictions
     path('predict/insights/', views.predict_insights_view, name='predict_insights'),
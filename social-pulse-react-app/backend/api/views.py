@@ -3,17 +3,21 @@ API Views for Social Pulse.
 All endpoints for auth, upload, preprocessing, EDA, ML training, insights, and dashboard.
 """
 import os
+import io
 import json
+import hashlib
 import pandas as pd
 from django.conf import settings
-from django.contrib.auth import get_user_model
+from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import cache
 from rest_framework import status, generics
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import Dataset, PreprocessingLog, EDAHistory, MLModel
+from .models import Dataset, PreprocessingLog, EDAHistory
 from .serializers import (
     RegisterSerializer, UserSerializer,
     DatasetSerializer, DatasetUploadSerializer,
@@ -21,10 +25,13 @@ from .serializers import (
     EDAHistorySerializer, MLModelSerializer,
     TrainRequestSerializer, InsightsRequestSerializer,
 )
-from .pipeline import preprocess_csv, get_data_preview, compute_data_health, get_full_dataframe
-from .ml_engine import train_lightgbm, train_catboost, get_insights, get_dashboard_data
+from .pipeline import (
+    preprocess_csv, get_data_preview, preview_records, compute_data_health, read_csv,
+    get_full_dataframe, get_full_dataframe_from_parquet, get_distinct_values,
+)
+from .ml_engine import get_insights, get_dashboard_data, analysis_columns
+from .tasks import train_models, submit_training, get_job
 from .mis_utils import calculate_mis_kpis, get_platform_summaries
-from .models import Dataset, PreprocessingLog, EDAHistory, MLModel
 
 import gc
 
@@ -55,6 +62,7 @@ def register_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AnonRateThrottle])
 def login_view(request):
     """Login with email + password, return JWT tokens."""
     email = request.data.get('email', '')
@@ -66,15 +74,10 @@ def login_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        user = User.objects.get(email=email)
-    except User.DoesNotExist:
-        return Response(
-            {'error': 'Invalid email or password.'},
-            status=status.HTTP_401_UNAUTHORIZED
-        )
-
-    if not user.check_password(password):
+    # USERNAME_FIELD is email; the backend also hashes for unknown emails,
+    # so both failure cases take the same time
+    user = authenticate(request, username=email, password=password)
+    if user is None:
         return Response(
             {'error': 'Invalid email or password.'},
             status=status.HTTP_401_UNAUTHORIZED
@@ -101,6 +104,17 @@ def user_profile_view(request):
 #  DATASET ENDPOINTS
 # ══════════════════════════════════════════════
 
+# Dataset responses are built straight from these fields; uploaded_at is
+# left a datetime for the renderer, which writes it as DatasetSerializer
+# does (ISO 8601 with microseconds, UTC as 'Z') while TIME_ZONE is UTC
+DATASET_FIELDS = tuple(DatasetSerializer.Meta.fields)
+
+
+def _dataset_dict(dataset):
+    """Helper: a Dataset as the dict DatasetSerializer would produce, without a serializer."""
+    return {field: getattr(dataset, field) for field in DATASET_FIELDS}
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def upload_dataset_view(request):
@@ -123,23 +137,23 @@ def upload_dataset_view(request):
     # Read the saved file to compute stats
     file_path = dataset.file.path
     try:
-        df = pd.read_csv(file_path)
-        dataset.row_count = len(df)
-        dataset.column_count = len(df.columns)
-        dataset.columns = list(df.columns)
-        dataset.save()
+        # Data health streams the file, so its counts double as the
+        # dataset stats without loading the whole CSV
+        health = compute_data_health(file_path)
 
-        # Build preview
-        preview_df = df.head(5).copy()
-        for col in preview_df.select_dtypes(include=['datetime64']).columns:
-            preview_df[col] = preview_df[col].astype(str)
-        preview_data = preview_df.fillna('').to_dict(orient='records')
+        # Only the preview rows are parsed into a frame. Without NA
+        # detection blank cells already come back as ''
+        preview_df = pd.read_csv(file_path, nrows=5, keep_default_na=False, na_filter=False)
+        dataset.row_count = health['totalRows']
+        dataset.column_count = health['totalColumns']
+        dataset.columns = list(preview_df.columns)
+        dataset.save(update_fields=['row_count', 'column_count', 'columns'])
 
-        # Data health
-        health = compute_data_health(file_path)
+        # Build preview
+        preview_data = preview_records(preview_df)
 
         return Response({
-            'dataset': DatasetSerializer(dataset).data,
+            'dataset': _dataset_dict(dataset),
             'preview': preview_data,
             'dataHealth': health,
         }, status=status.HTTP_201_CREATED)
@@ -156,8 +170,8 @@ def upload_dataset_view(request):
 @permission_classes([IsAuthenticated])
 def list_datasets_view(request):
     """List all datasets for the current user."""
-    datasets = Dataset.objects.filter(user=request.user)
-    return Response(DatasetSerializer(datasets, many=True).data)
+    datasets = Dataset.objects.filter(user=request.user).values(*DATASET_FIELDS)
+    return Response(list(datasets))
 
 
 @api_view(['POST'])
@@ -172,29 +186,92 @@ def activate_dataset_view(request, dataset_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
+    # Dataset.save deactivates the user's other datasets in the same transaction
     dataset.is_active = True
-    dataset.save()
+    dataset.save(update_fields=['is_active'])
 
     return Response({
         'message': 'Dataset activated.',
-        'dataset': DatasetSerializer(dataset).data,
+        'dataset': _dataset_dict(dataset),
     })
 
 
-def _get_active_dataset(user):
-    """Helper: get the active dataset for a user, or None."""
-    return Dataset.objects.filter(user=user, is_active=True).first()
+def _get_active_dataset(request):
+    """
+    Helper: get the active dataset for the requesting user, or None.
+    The preprocessing log is joined in and the result is kept on the
+    request, so one endpoint never queries for it twice.
+    """
+    if not hasattr(request, '_active_dataset'):
+        request._active_dataset = (
+            Dataset.objects.select_related('preprocessing_log')
+            .filter(user=request.user, is_active=True)
+            .first()
+        )
+    return request._active_dataset
 
 
 def _get_data_file_path(dataset):
-    """Helper: get the best available data file (processed or raw)."""
+    """
+    Helper: get the best available data file (processed or raw). This stays
+    the CSV; pipeline.get_full_dataframe reads its Parquet copy when fresh.
+    The database is trusted here: a processed file that has gone missing
+    surfaces as an error from the read rather than a stat on every request.
+    """
     try:
         log = dataset.preprocessing_log
-        if log.processed_file and os.path.exists(log.processed_file.path):
-            return log.processed_file.path
     except PreprocessingLog.DoesNotExist:
-        pass
-    return dataset.file.path
+        return dataset.file.path
+    return log.processed_file.path if log.processed_file else dataset.file.path
+
+
+# Parsed frames are cached as Parquet bytes for this long (seconds)
+DATAFRAME_CACHE_TTL = 3600
+# ...but only in a cache every worker shares (Redis), where one copy serves
+# them all; a per-process LocMem cache would keep a copy in each worker
+FRAME_CACHE_SHARED = not settings.CACHES['default']['BACKEND'].endswith(('LocMemCache', 'DummyCache'))
+# Larger frames are re-read from the file rather than cached (bytes)
+DATAFRAME_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# Computed responses that only depend on the data file (seconds)
+RESPONSE_CACHE_TTL = 6 * 3600
+
+
+def _dataset_cache_key(prefix, dataset, file_path, *parts):
+    """
+    Helper: cache key for data derived from a dataset file. The file path
+    and mtime are hashed in, so reprocessing or re-uploading never serves
+    a stale entry; parts distinguish request variants (e.g. a filter).
+    """
+    raw = ':'.join(str(p) for p in (file_path, os.path.getmtime(file_path), *parts))
+    return f"{prefix}:{dataset.id}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+def _load_df_cached(dataset, file_path=None, select=None):
+    """
+    Helper: load the dataset's DataFrame through the Django cache, stored as
+    Parquet bytes, when that cache is shared. select narrows the columns as
+    in get_full_dataframe and gets its own cache entry.
+    """
+    file_path = file_path or _get_data_file_path(dataset)
+    parts = (select.__name__,) if select else ()
+    key = _dataset_cache_key('dataset_df', dataset, file_path, *parts)
+
+    if not FRAME_CACHE_SHARED:
+        return get_full_dataframe(file_path, select)
+
+    buf = cache.get(key)
+    if buf is not None:
+        return get_full_dataframe_from_parquet(io.BytesIO(buf))
+
+    df = get_full_dataframe(file_path, select)
+    try:
+        buf = df.to_parquet(index=False)
+    except Exception:
+        # Frames pyarrow can't serialise just go uncached
+        return df
+    if len(buf) <= DATAFRAME_CACHE_MAX_BYTES:
+        cache.set(key, buf, DATAFRAME_CACHE_TTL)
+    return df
 
 
 # ══════════════════════════════════════════════
@@ -205,7 +282,7 @@ def _get_data_file_path(dataset):
 @permission_classes([IsAuthenticated])
 def process_data_view(request):
     """Preprocess the active dataset with given cleaning options."""
-    dataset = _get_active_dataset(request.user)
+    dataset = _get_active_dataset(request)
     if not dataset:
         return Response(
             {'error': 'No active dataset. Please upload and activate a dataset first.'},
@@ -237,13 +314,9 @@ def process_data_view(request):
         dataset.row_count = result['rows_after']
         dataset.column_count = result['column_count']
         dataset.columns = result['columns']
-        dataset.save()
-
-
-
+        dataset.save(update_fields=['row_count', 'column_count', 'columns'])
 
         # Trigger Garbage Collection before returning
-        del df
         gc.collect()
 
         return Response({
@@ -270,7 +343,7 @@ def process_data_view(request):
 @permission_classes([IsAuthenticated])
 def eda_report_view(request):
     """Generate EDA report JSON using ydata-profiling for the active dataset."""
-    dataset = _get_active_dataset(request.user)
+    dataset = _get_active_dataset(request)
     if not dataset:
         return Response(
             {'error': 'No active dataset.'},
@@ -280,7 +353,15 @@ def eda_report_view(request):
     file_path = _get_data_file_path(dataset)
 
     try:
-        df = pd.read_csv(file_path)
+        # The data file only changes on upload/preprocess; reuse the last
+        # report if it was generated after the file was written
+        latest = dataset.eda_reports.first()
+        if latest and latest.generated_at.timestamp() >= os.path.getmtime(file_path):
+            return Response({
+                'eda': EDAHistorySerializer(latest).data,
+            })
+
+        df = read_csv(file_path)
 
         # Generate profiling report - manually forcing custom EDA to save memory
         try:
@@ -295,7 +376,7 @@ def eda_report_view(request):
         # Save EDA history
         eda = EDAHistory.objects.create(
             dataset=dataset,
-            report_json=report_json,
+            report_blob=EDAHistory.compress_report(report_json),
         )
 
         del df
@@ -314,39 +395,45 @@ def eda_report_view(request):
 
 def _manual_eda(df):
     """Fallback manual EDA when ydata-profiling is not installed."""
-    import numpy as np
+    # Frame-wide sweeps; the loop below only looks values up
+    n_rows = len(df)
+    n_missing = df.isna().sum()
+    n_distinct = df.nunique()
+    numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
+    numeric_stats = df[numeric_cols].agg(['mean', 'std', 'min', 'max', 'median'])
+
+    total_missing = int(n_missing.sum())
+    # Header-only CSVs have no rows, so no missing percentages
+    n_cells = n_rows * len(df.columns)
     report = {
         'table': {
-            'n': len(df),
+            'n': n_rows,
             'n_var': len(df.columns),
-            'n_cells_missing': int(df.isna().sum().sum()),
+            'n_cells_missing': total_missing,
             'n_duplicates': int(df.duplicated().sum()),
-            'p_cells_missing': round(float(df.isna().sum().sum() / (len(df) * len(df.columns)) * 100), 2),
+            'p_cells_missing': round(float(total_missing / n_cells * 100), 2) if n_cells else 0.0,
         },
         'variables': {},
     }
 
     for col in df.columns:
-        col_data = df[col]
+        missing = int(n_missing[col])
         var_info = {
-            'type': str(col_data.dtype),
-            'n_missing': int(col_data.isna().sum()),
-            'p_missing': round(float(col_data.isna().mean() * 100), 2),
-            'n_distinct': int(col_data.nunique()),
-            'count': int(col_data.count()),
+            'type': str(df[col].dtype),
+            'n_missing': missing,
+            'p_missing': round(float(missing / n_rows * 100), 2) if n_rows else 0.0,
+            'n_distinct': int(n_distinct[col]),
+            'count': n_rows - missing,
         }
 
-        if pd.api.types.is_numeric_dtype(col_data):
-            desc = col_data.describe()
+        if col in numeric_stats:
+            stats = numeric_stats[col]
             var_info.update({
-                'mean': round(float(desc.get('mean', 0)), 4),
-                'std': round(float(desc.get('std', 0)), 4),
-                'min': round(float(desc.get('min', 0)), 4),
-                'max': round(float(desc.get('max', 0)), 4),
-                'median': round(float(col_data.median()), 4),
+                stat: round(float(stats[stat]), 4)
+                for stat in ('mean', 'std', 'min', 'max', 'median')
             })
         else:
-            top_values = col_data.value_counts().head(5)
+            top_values = df[col].value_counts().head(5)
             var_info['top_values'] = {str(k): int(v) for k, v in top_values.items()}
 
         report['variables'][col] = var_info
@@ -362,7 +449,7 @@ def _manual_eda(df):
 @permission_classes([IsAuthenticated])
 def train_model_view(request):
     """Train ML models on the active dataset."""
-    dataset = _get_active_dataset(request.user)
+    dataset = _get_active_dataset(request)
     if not dataset:
         return Response(
             {'error': 'No active dataset.'},
@@ -377,57 +464,16 @@ def train_model_view(request):
     file_path = _get_data_file_path(dataset)
 
     try:
-        df = pd.read_csv(file_path)
-        results = {}
-
-        # Train LightGBM Regression
-        if model_type in ('regression', 'both'):
-            try:
-                lgbm_result = train_lightgbm(df)
-                MLModel.objects.update_or_create(
-                    dataset=dataset,
-                    model_type=MLModel.ModelType.REGRESSION_LGBM,
-                    defaults={
-                        'model_file': lgbm_result['model_relative'],
-                        'metrics': lgbm_result['metrics'],
-                        'feature_columns': lgbm_result['feature_columns'],
-                    }
-                )
-                results['regression'] = {
-                    'title': 'LightGBM Regression',
-                    'subtitle': 'Predict Engagement Rate',
-                    'metrics': lgbm_result['metrics'],
-                    'feature_columns': lgbm_result['feature_columns'],
-                    'training_samples': lgbm_result['training_samples'],
-                    'test_samples': lgbm_result['test_samples'],
-                }
-            except Exception as e:
-                results['regression'] = {'error': str(e)}
-
-        # Train CatBoost Classification
-        if model_type in ('classification', 'both'):
-            try:
-                catboost_result = train_catboost(df)
-                MLModel.objects.update_or_create(
-                    dataset=dataset,
-                    model_type=MLModel.ModelType.CLASSIFICATION_CATBOOST,
-                    defaults={
-                        'model_file': catboost_result['model_relative'],
-                        'metrics': catboost_result['metrics'],
-                        'feature_columns': catboost_result['feature_columns'],
-                    }
-                )
-                results['classification'] = {
-                    'title': 'CatBoost Classification',
-                    'subtitle': 'Predict Engagement Category',
-                    'metrics': catboost_result['metrics'],
-                    'feature_columns': catboost_result['feature_columns'],
-                    'class_names': catboost_result['class_names'],
-                    'training_samples': catboost_result['training_samples'],
-                    'test_samples': catboost_result['test_samples'],
-                }
-            except Exception as e:
-                results['classification'] = {'error': str(e)}
+        df = _load_df_cached(dataset, file_path)
+
+        if serializer.validated_data.get('background'):
+            job_id = submit_training(dataset, df, model_type, request.user.pk)
+            return Response({
+                'message': 'Training started.',
+                'job_id': job_id,
+            }, status=status.HTTP_202_ACCEPTED)
+
+        results = train_models(dataset, df, model_type)
 
         del df
         gc.collect()
@@ -446,6 +492,26 @@ def train_model_view(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def training_status_view(request, job_id):
+    """Report the state (and, once finished, the results) of a background training job."""
+    job = get_job(job_id)
+    if not job or job.get('user_id') != request.user.pk:
+        return Response(
+            {'error': 'Training job not found.'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    response = {'job_id': job_id, 'state': job['state']}
+    if job['state'] == 'SUCCESS':
+        response['message'] = 'Training complete.'
+        response['results'] = job['results']
+    elif job['state'] == 'FAILURE':
+        response['error'] = f"Training failed: {job['error']}"
+    return Response(response)
+
+
 # ══════════════════════════════════════════════
 #  INSIGHTS / PREDICTION ENDPOINT
 # ══════════════════════════════════════════════
@@ -454,7 +520,7 @@ def train_model_view(request):
 @permission_classes([IsAuthenticated])
 def predict_insights_view(request):
     """Generate dynamic insights for a given platform + content type."""
-    dataset = _get_active_dataset(request.user)
+    dataset = _get_active_dataset(request)
     if not dataset:
         return Response(
             {'error': 'No active dataset.'},
@@ -471,8 +537,11 @@ def predict_insights_view(request):
     file_path = _get_data_file_path(dataset)
 
     try:
-        df = pd.read_csv(file_path)
-        insights = get_insights(df, platform, content_type)
+        df = _load_df_cached(dataset, file_path, select=analysis_columns)
+        insights = get_insights(
+            df, platform, content_type,
+            cache_key=(file_path, os.path.getmtime(file_path)),
+        )
 
         del df
         gc.collect()
@@ -502,7 +571,7 @@ def predict_insights_view(request):
 @permission_classes([IsAuthenticated])
 def dashboard_view(request):
     """Get aggregated dashboard data for VisionDeck."""
-    dataset = _get_active_dataset(request.user)
+    dataset = _get_active_dataset(request)
     if not dataset:
         return Response(
             {'error': 'No active dataset.'},
@@ -512,11 +581,19 @@ def dashboard_view(request):
     file_path = _get_data_file_path(dataset)
 
     try:
-        df = pd.read_csv(file_path)
         platform = request.query_params.get('platform')
-        dashboard = get_dashboard_data(df, platform=platform)
+        key = _dataset_cache_key('dashboard', dataset, file_path, platform)
+        dashboard = cache.get(key)
+        if dashboard is not None:
+            return Response(dashboard)
+
+        df = _load_df_cached(dataset, file_path, select=analysis_columns)
+        dashboard = get_dashboard_data(
+            df, platform=platform,
+            cache_key=(file_path, os.path.getmtime(file_path)),
+        )
+        cache.set(key, dashboard, RESPONSE_CACHE_TTL)
 
-        
         del df
         gc.collect()
 
@@ -539,7 +616,7 @@ def dashboard_view(request):
 @permission_classes([IsAuthenticated])
 def filter_options_view(request):
     """Get unique platform and content type values from active dataset."""
-    dataset = _get_active_dataset(request.user)
+    dataset = _get_active_dataset(request)
     if not dataset:
         return Response(
             {'error': 'No active dataset.'},
@@ -549,25 +626,19 @@ def filter_options_view(request):
     file_path = _get_data_file_path(dataset)
 
     try:
-        df = pd.read_csv(file_path)
-
-        platforms = []
-        content_types = []
-
-        for col in ['Platform', 'platform']:
-            if col in df.columns:
-                platforms = sorted(df[col].dropna().unique().tolist())
-                break
-
-        for col in ['Content_Type', 'content_type']:
-            if col in df.columns:
-                content_types = sorted(df[col].dropna().unique().tolist())
-                break
+        key = _dataset_cache_key('filter_options', dataset, file_path)
+        options = cache.get(key)
+        if options is None:
+            platforms, content_types = get_distinct_values(
+                file_path, [('Platform', 'platform'), ('Content_Type', 'content_type')],
+            )
+            options = {
+                'platforms': platforms,
+                'content_types': content_types,
+            }
+            cache.set(key, options, RESPONSE_CACHE_TTL)
 
-        return Response({
-            'platforms': platforms,
-            'content_types': content_types,
-        })
+        return Response(options)
 
     except Exception as e:
         return Response(
@@ -582,7 +653,7 @@ def filter_options_view(request):
 @permission_classes([IsAuthenticated])
 def mis_dashboard_view(request):
     """Get high-level business KPIs and platform summaries."""
-    dataset = _get_active_dataset(request.user)
+    dataset = _get_active_dataset(request)
     if not dataset:
         return Response(
             {'error': 'No active dataset. Please upload and activate a dataset first.'},
@@ -591,7 +662,7 @@ def mis_dashboard_view(request):
 
     file_path = _get_data_file_path(dataset)
     try:
-        df = pd.read_csv(file_path)
+        df = _load_df_cached(dataset, file_path)
         kpis = calculate_mis_kpis(df)
         platform_summaries = get_platform_summaries(df)
 
@@ -0,0 +1,17 @@
+"""
+Gunicorn settings, picked up automatically when gunicorn is started from
+the backend directory (gunicorn social_pulse.wsgi:application).
+"""
+import os
+
+# Threaded workers keep client connections alive between requests (the
+# default sync worker closes every connection) and let one worker serve
+# other requests while a view waits on TiDB or a dataset read. Each worker
+# holds its own pandas/LightGBM state, so scale threads before workers.
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Outlast the proxy's idle timeout so it can reuse upstream connections
+# instead of reconnecting for each React poll
+keepalive = 75
@@ -3,3 +3,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_pulse.settings')
 application = get_asgi_application()
+
+# Server processes only (not manage.py commands): load the ML libraries
+# in the background so the first insight or training request doesn't wait
+from api.ml_engine import warm_up  # noqa: E402
+warm_up()
@@ -16,7 +16,18 @@ SECRET_KEY = os.getenv('SECRET_KEY', 'django-insecure-social-pulse-dev-key')
 # DEBUG is False on Render, True locally
 DEBUG = 'RENDER' not in os.environ
 
-ALLOWED_HOSTS = ['*']
+# Exact host names, so Host validation is a plain comparison rather than
+# a wildcard match. Render provides the service's own hostname.
+ALLOWED_HOSTS = [
+    'social-pulse-mxgn.onrender.com',
+    'social-pulse-n4r7.onrender.com',
+    'localhost',
+    '127.0.0.1',
+]
+
+RENDER_EXTERNAL_HOSTNAME = os.getenv('RENDER_EXTERNAL_HOSTNAME')
+if RENDER_EXTERNAL_HOSTNAME and RENDER_EXTERNAL_HOSTNAME not in ALLOWED_HOSTS:
+    ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
 
 # ── Installed Apps ──
 INSTALLED_APPS = [
@@ -52,8 +63,15 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
+        'APP_DIRS': False,
         'OPTIONS': {
+            # Only the admin renders templates, all from app directories;
+            # with DIRS empty the filesystem loader would just be a miss
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -71,9 +89,20 @@ WSGI_APPLICATION = 'social_pulse.wsgi.application'
 # ── Database (TiDB Cloud SSL Fix) ──
 
 # 1. Parse the database URL safely
+# Set DATABASE_POOLER when DATABASE_URL points at a local connection pool
+# (e.g. a ProxySQL sidecar) that holds the TLS connections to TiDB. Django
+# then talks plain TCP to it and hands its slot back after a minute.
+DATABASE_POOLER = os.getenv('DATABASE_POOLER', '').lower() in ('1', 'true', 'yes')
+
+# Keep connections (and their TLS sessions) open across requests for up
+# to DJANGO_MAX_CONN_AGE seconds; TiDB drops idle ones after ~30 min, so
+# each reused connection is health-checked before a request uses it.
+DB_CONN_MAX_AGE = int(os.getenv('DJANGO_MAX_CONN_AGE', '60' if DATABASE_POOLER else '1800'))
+
 db_config = dj_database_url.config(
-    conn_max_age=600,
-    ssl_require=True
+    conn_max_age=DB_CONN_MAX_AGE,
+    conn_health_checks=True,
+    ssl_require=not DATABASE_POOLER
 )
 
 if not db_config:
@@ -85,19 +114,46 @@ if 'OPTIONS' in db_config and 'sslmode' in db_config['OPTIONS']:
     del db_config['OPTIONS']['sslmode']
 
 # 3. CONFIGURE SSL: TiDB Cloud Serverless requires a secure connection.
-# We add the 'ssl' key which mysqlclient uses to enable TLS.
-if 'sqlite' not in db_config['ENGINE']:
+# We add the 'ssl' key which mysqlclient uses to enable TLS. Behind a
+# pooler the pooler's backend connections carry the TLS instead.
+if 'sqlite' not in db_config['ENGINE'] and not DATABASE_POOLER:
     if 'OPTIONS' not in db_config:
         db_config['OPTIONS'] = {}
     
-    # Render and TiDB Serverless work best with this configuration:
+    # Render and TiDB Serverless work best with this configuration.
+    # SSL_CA_PATH overrides the bundle location for images that keep it elsewhere
     db_config['OPTIONS']['ssl'] = {
-        'ca': '/etc/ssl/certs/ca-certificates.crt' # Standard path on Render/Ubuntu
+        'ca': os.getenv('SSL_CA_PATH', '/etc/ssl/certs/ca-certificates.crt') # Standard path on Render/Ubuntu
     }
 
 DATABASES = {
     'default': db_config
 }
+# ── Cache ──
+# Parsed datasets, computed dashboards and training job state live in the
+# cache. With REDIS_URL set every worker shares one Redis cache (and can
+# report on each other's training jobs); otherwise each process keeps its own.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Sessions only back the Django admin (the API authenticates with JWT and
+# never touches request.session). Read them through the cache so admin page
+# loads skip the django_session query; the table stays the source of truth.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 # ── Auth ──
 AUTH_USER_MODEL = 'api.User'
 
@@ -125,11 +181,34 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 
-# Enable WhiteNoise to compress and serve static files efficiently
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Enable WhiteNoise to compress and serve static files efficiently.
+# collectstatic (build.sh) writes hashed names plus .gz and, with the
+# brotli extra installed, .br siblings that are served as-is.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Hashed names from the manifest are already served with a one-year
+# "immutable" Cache-Control by WhiteNoise; this covers requests for the
+# unhashed names, which WhiteNoise otherwise caches for just 60 seconds
+WHITENOISE_MAX_AGE = 0 if DEBUG else 24 * 60 * 60
+
+# Index STATIC_ROOT once at startup and never consult the finders or the
+# filesystem per request, whatever DEBUG says. runserver serves static
+# files through django.contrib.staticfiles during development anyway.
+WHITENOISE_USE_FINDERS = False
+WHITENOISE_AUTOREFRESH = False
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Uploads, processed parquet files and trained models are read back by local
+# path, so they stay on the filesystem; point MEDIA_ROOT at a persistent disk
+# in production so they survive restarts instead of living in the build dir
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -141,30 +220,45 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson (de)serializes JSON several times faster than the stdlib
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_PARSER_CLASSES': (
-        'rest_framework.parsers.JSONParser',
+        'api.renderers.OrjsonParser',
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ),
+    # Only applied where a view opts in (login), keyed on client IP
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '20/minute',
+    },
 }
 
 # ── Simple JWT ──
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=2),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
-    'ROTATE_REFRESH_TOKENS': True,
+    # The frontend keeps its original refresh token, so minting a new one
+    # on every refresh was wasted signing work
+    'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': False,
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
 # ── CORS ──
+# Production origins are matched by a single anchored pattern: frontend
+# (socialpuls.vercel.app) and the two backend hosts. corsheaders checks the
+# plain list first, re-parsing every entry per request, so it only carries
+# the local dev servers and stays empty in production.
+CORS_ALLOWED_ORIGIN_REGEXES = [
+    r'^https://(socialpuls\.vercel\.app|social-pulse-(mxgn|n4r7)\.onrender\.com)$',
+]
 CORS_ALLOWED_ORIGINS = [
-    "https://socialpuls.vercel.app",          # Frontend Production
-    "https://social-pulse-mxgn.onrender.com",# Backend Self
-    "https://social-pulse-n4r7.onrender.com", 
     "http://localhost:5173",                  # Local React
     "http://localhost:3000",
-]
+] if DEBUG else []
 
 CSRF_TRUSTED_ORIGINS = [
     "https://socialpuls.vercel.app",
@@ -175,4 +269,7 @@ CORS_ALLOW_CREDENTIALS = True
 
 # ── File Upload Limits ──
 DATA_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50 MB
-FILE_UPLOAD_MAX_MEMORY_SIZE = 52428800  # 50 MB
\ No newline at end of file
+# Uploads above 2 MB are streamed to a temp file by Django's default
+# TemporaryFileUploadHandler instead of being held in memory, and
+# FileSystemStorage then moves that file into MEDIA_ROOT
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2 * 1024 * 1024  # 2 MB
\ No newline at end of file
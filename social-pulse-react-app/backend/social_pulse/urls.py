@@ -2,16 +2,21 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from django.http import JsonResponse
+from django.http import HttpResponse
+import json
+
+# The home (health check) body never changes, so encode it once
+_HOME_BODY = json.dumps({
+    "status": "online",
+    "message": "Social Pulse Backend is running successfully 🚀"
+}).encode()
 
 # Define a simple home view directly here
 def home(request):
-    return JsonResponse({
-        "status": "online",
-        "message": "Social Pulse Backend is running successfully 🚀"
-    })
+    return HttpResponse(_HOME_BODY, content_type='application/json')
 
-urlpatterns = [
+# Built once as a tuple; nothing appends to it after import
+urlpatterns = (
     # 1. Root URL check (http://your-site.com/)
     path('', home, name='home'),
 
@@ -20,8 +25,8 @@ urlpatterns = [
 
     # 3. API Routes (Connecting /auth/register/ directly)
     path('', include('api.urls')),
-]
-
-# Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+) + (
+    # Serve media files in development
+    tuple(static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT))
+    if settings.DEBUG else ()
+)
\ No newline at end of file
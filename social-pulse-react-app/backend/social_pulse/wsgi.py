@@ -3,3 +3,8 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'social_pulse.settings')
 application = get_wsgi_application()
+
+# Server processes only (not manage.py commands): load the ML libraries
+# in the background so the first insight or training request doesn't wait
+from api.ml_engine import warm_up  # noqa: E402
+warm_up()